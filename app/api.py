@@ -29,7 +29,7 @@ Endpoints:
     POST /api/submit                          — create ad from Mini App
 
   Admin:
-    GET  /api/admin/pending                   — pending ads for moderation
+    GET  /api/admin/pending                   — pending ads for moderation (keyset: limit, cursor)
     GET  /api/admin/stats                     — ad statistics
     POST /api/admin/approve/{ad_type}/{ad_id} — approve ad
     POST /api/admin/reject/{ad_type}/{ad_id}  — reject ad
@@ -37,47 +37,80 @@ Endpoints:
     PUT  /api/admin/ads/plate/{ad_id}         — edit any plate ad (admin)
 """
 
+import asyncio
+import base64
+import binascii
+import hashlib
 import hmac
-import json
 import logging
 import mimetypes
 import random
 import re
+import time
 from datetime import datetime, timezone, timedelta
+from operator import attrgetter
 
-from aiohttp import ClientSession as HttpClientSession
+from aiohttp import ClientSession as HttpClientSession, ClientTimeout, TCPConnector
 from aiohttp import web
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
 from aiogram.fsm.storage.base import StorageKey
-from sqlalchemy import select, func, or_
+import orjson
+from sqlalchemy import (
+    BigInteger, Float, Integer, String, bindparam, cast, exists, insert, literal, literal_column,
+    select, func, or_,
+    tuple_, union_all, update,
+)
+from sqlalchemy.dialects.postgresql import array, insert as pg_insert
+from sqlalchemy.exc import TimeoutError as SATimeoutError
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import selectinload
 
 from app.auth import get_authenticated_user, get_authenticated_user_or_fallback
 from app.config import settings
 from app.constants import (
     AD_EXPIRY_DAYS,
+    ADMIN_GENERATE_MAX_COUNT,
+    ADMIN_PENDING_MAX_PAGE_SIZE,
+    ADMIN_PENDING_PAGE_SIZE,
     DEFAULT_PAGE_SIZE,
     DESCRIPTION_PREVIEW_LENGTH,
     DUPLICATE_CHECK_DAYS,
     MAX_CAR_PHOTOS,
     MAX_PAGE_SIZE,
     MAX_PLATE_PHOTOS,
+    CITIES_CACHE_TTL,
+    LISTING_TOTAL_CACHE_TTL,
     MAX_SUBMIT_BODY_SIZE,
+    PHOTO_CACHE_MAX_AGE,
+    PHOTO_PROXY_CHUNK_SIZE,
+    TG_FILE_PATH_CACHE_SIZE,
+    TG_FILE_PATH_CACHE_TTL,
+    TG_CACHE_MAX_BYTES,
+    TG_CACHE_PRUNE_INTERVAL,
+    TG_HTTP_CONNECT_TIMEOUT,
+    TG_HTTP_DNS_CACHE_TTL,
+    TG_HTTP_KEEPALIVE_TIMEOUT,
+    TG_HTTP_LIMIT,
+    TG_HTTP_LIMIT_PER_HOST,
+    TG_HTTP_READ_TIMEOUT,
+    UPLOAD_CHUNK_SIZE,
 )
 from app.handlers.photos import PhotoCollectStates
-from app.models.car_ad import AdStatus, CarAd, FuelType, Transmission
+from app.models.car_ad import CAR_SEARCH_TEXT, AdStatus, CarAd, FuelType, Transmission
 from app.models.ad_view import AdView
 from app.models.favorite import Favorite
 from app.models.photo import AdPhoto, AdType
-from app.models.plate_ad import PlateAd
+from app.models.plate_ad import PLATE_SEARCH_TEXT, PlateAd
 from app.models.user import User
-from app.services.car_ad_service import create_car_ad
-from app.services.photo_service import load_first_photos_map
-from app.services.plate_ad_service import create_plate_ad
-from app.services.user_service import get_or_create_user, get_user_active_ads_count
+from app.services.car_ad_service import approve_car_ad, create_car_ad, reject_car_ad
+from app.services.photo_service import first_photo_subquery
+from app.services.plate_ad_service import approve_plate_ad, create_plate_ad, reject_plate_ad
+from app.services.user_service import get_author_with_ads_count, get_or_create_user
 from app.services.view_service import record_unique_view
 from app.texts import (
     PHOTOS_SENT_TO_MODERATION,
+    USER_AD_APPROVED,
+    USER_AD_REJECTED,
     WEB_APP_CAR_CREATED,
     WEB_APP_PLATE_CREATED,
     WEB_APP_SEND_PHOTOS,
@@ -88,81 +121,458 @@ from app.utils.publish import publish_to_channel
 from app.data.brands import BRANDS
 from app.utils.validators import validate_car_ad, validate_plate_ad
 from app.utils.rate_limiter import submit_limiter
-from app.utils.photo_storage import save_photo, get_photo_path, is_local_photo, ALLOWED_TYPES, MAX_PHOTO_SIZE
+from app.utils.photo_storage import (
+    get_photo_path, is_local_photo, get_tg_cache_path,
+    open_tg_cache_tempfile, save_tg_cache_from_path, prune_tg_cache,
+    filter_existing_photos, open_upload_tempfile, discard_upload_tempfile, save_photo_from_path,
+    sniff_image_type, ALLOWED_TYPES, MAX_PHOTO_SIZE, SNIFF_HEADER_SIZE,
+)
+from app.utils.profile_cache import invalidate_profile, profile_cache
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 # Telegram file_id: alphanumeric, underscores, dashes only
 _FILE_ID_RE = re.compile(r"^[A-Za-z0-9_\-]+$")
+_file_id_match = _FILE_ID_RE.match
+
+# file_id → file_path из Telegram getFile (путь стабилен, ссылка живёт ≥ 1 часа)
+_tg_file_paths: TTLCache[str, str] = TTLCache(
+    ttl_seconds=TG_FILE_PATH_CACHE_TTL, max_size=TG_FILE_PATH_CACHE_SIZE,
+)
+
+# Заголовки для фото, отдаваемых с диска (FileResponse сам обрабатывает Range)
+_PHOTO_FILE_HEADERS = {
+    "Cache-Control": f"public, max-age={PHOTO_CACHE_MAX_AGE}",
+    "Accept-Ranges": "bytes",
+}
+
+# Заголовки клиента, которые пробрасываем в Telegram при проксировании фото
+_PROXY_REQUEST_HEADERS = ("Range", "If-Range", "If-Modified-Since")
+# Заголовки ответа Telegram, которые отдаём клиенту
+_PROXY_RESPONSE_HEADERS = ("Content-Range", "Accept-Ranges", "Last-Modified")
+
+# Готовый ответ /api/cities: (body, etag). Сбрасывается при изменении
+# объявлений через API; одобрения из бота подхватываются по TTL.
+_cities_cache: TTLCache[str, tuple[bytes, str]] = TTLCache(
+    ttl_seconds=CITIES_CACHE_TTL, max_size=1,
+)
+
+# CORS: разрешённые origin'ы и общие заголовки (собираются один раз)
+_ALLOWED_ORIGINS = frozenset({"https://auto.xlmmama.ru"})
+_dev_origin_match = re.compile(r"http://(?:localhost|127\.0\.0\.1)(?::\d+)?").fullmatch
+_CORS_HEADERS = {
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, X-Telegram-User-Id, X-Telegram-Init-Data",
+    "Access-Control-Expose-Headers": "X-Telegram-User-Id",
+}
+
+# Админы: frozenset для O(1) проверки членства на каждом админском запросе
+_ADMIN_IDS = frozenset(settings.admin_ids)
+
+# total каталога без фильтров: CarAd/PlateAd → count. Окно COUNT(*) OVER ()
+# заставляет Postgres пройти всю выборку, а не только страницу, — на главной
+# странице total берётся отсюда. Свежесть — LISTING_TOTAL_CACHE_TTL.
+_listing_totals: TTLCache[type, int] = TTLCache(
+    ttl_seconds=LISTING_TOTAL_CACHE_TTL, max_size=2,
+)
+
+# Когда последний раз ужимали дисковый кеш Telegram-фото (time.monotonic)
+_tg_cache_pruned_at = float("-inf")
+
+# Экранирование спецсимволов LIKE за один проход str.translate
+_LIKE_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "%": "\\%", "_": "\\_"})
+
+# Enum → строковое значение для JSON (dict-lookup вместо .value на каждой строке)
+_FUEL_VAL: dict[FuelType, str] = {e: e.value for e in FuelType}
+_TRANS_VAL: dict[Transmission, str] = {e: e.value for e in Transmission}
+_STATUS_VAL: dict[AdStatus, str] = {e: e.value for e in AdStatus}
+
+# Фильтр «не просрочено» (F16). Форма выражения постоянна, меняется только
+# момент времени — он передаётся bindparam'ом now_ts при execute, так что
+# скомпилированный SQL берётся из кеша SQLAlchemy.
+_CAR_NOT_EXPIRED = or_(CarAd.expires_at.is_(None), CarAd.expires_at > bindparam("now_ts"))
+_PLATE_NOT_EXPIRED = or_(PlateAd.expires_at.is_(None), PlateAd.expires_at > bindparam("now_ts"))
+
+# Кеш _coarse_utc_now(): (секунда monotonic, datetime)
+_coarse_now_tick = -1
+_coarse_now: datetime | None = None
+
+# Статусы объявлений → ключи счётчиков в профиле
+_STATUS_LABELS: dict[AdStatus, str] = {
+    AdStatus.APPROVED: "active",
+    AdStatus.PENDING: "pending",
+    AdStatus.REJECTED: "rejected",
+}
+
+# Метки статусов для админской статистики (SOLD не учитывается)
+_ADMIN_STATS_LABELS: dict[AdStatus, str] = {
+    AdStatus.PENDING: "pending",
+    AdStatus.APPROVED: "approved",
+    AdStatus.REJECTED: "rejected",
+}
+# admin_get_stats: число объявлений по статусам
+_CAR_STATUS_COUNTS = select(CarAd.status, func.count()).group_by(CarAd.status)
+_PLATE_STATUS_COUNTS = select(PlateAd.status, func.count()).group_by(PlateAd.status)
+
+# Часто выполняемые запросы — собираются один раз, параметры через bindparam
+_USER_BY_TG = select(User).where(User.telegram_id == bindparam("tg"))
+_USER_ID_BY_TG = select(User.id).where(User.telegram_id == bindparam("tg")).scalar_subquery()
+_USER_BANNED_BY_TG = select(User.is_banned).where(User.telegram_id == bindparam("tg"))
+# Бан/разбан одним UPDATE ... RETURNING (без SELECT перед изменением)
+_SET_USER_BANNED = (
+    update(User)
+    .where(User.telegram_id == bindparam("tg"))
+    .values(is_banned=bindparam("banned"))
+    .returning(User.id)
+    .execution_options(synchronize_session=False)
+)
+# Все объявления пользователя (get_user_ads, admin_get_user_detail) по
+# telegram_id одним UNION ALL: только колонки ответа + обложка, новые первые
+_USER_ADS = union_all(
+    select(
+        literal("car").label("kind"), CarAd.id,
+        (CarAd.brand + " " + CarAd.model).label("title"),
+        CarAd.status, CarAd.price, CarAd.city, CarAd.created_at,
+        first_photo_subquery(AdType.CAR, CarAd.id),
+    ).where(CarAd.user_id == _USER_ID_BY_TG),
+    select(
+        literal("plate").label("kind"), PlateAd.id,
+        PlateAd.plate_number.label("title"),
+        PlateAd.status, PlateAd.price, PlateAd.city, PlateAd.created_at,
+        first_photo_subquery(AdType.PLATE, PlateAd.id),
+    ).where(PlateAd.user_id == _USER_ID_BY_TG),
+).order_by(literal_column("created_at").desc())
+# Профиль (get_profile): пользователь и счётчики его объявлений по статусам
+# одним запросом — коррелированные COUNT(*) по ix_*_ads_user_status.
+# Колонки счётчиков: car_active, car_pending, ..., plate_rejected.
+_PROFILE = select(
+    User.full_name, User.username, User.created_at,
+    *(
+        select(func.count()).select_from(model)
+        .where(model.user_id == User.id, model.status == status)
+        .correlate(User)
+        .scalar_subquery()
+        .label(f"{kind}_{label}")
+        for kind, model in (("car", CarAd), ("plate", PlateAd))
+        for status, label in _STATUS_LABELS.items()
+    ),
+).where(User.telegram_id == bindparam("tg"))
+# Колонки карточки каталога: Row-кортежи без ORM-гидрации, photo —
+# коррелированный подзапрос. total — окно COUNT(*) OVER () в том же запросе.
+_CAR_LIST_COLUMNS = (
+    CarAd.id, CarAd.brand, CarAd.model, CarAd.year, CarAd.price,
+    CarAd.city, CarAd.mileage, CarAd.fuel_type, CarAd.transmission,
+    CarAd.view_count,
+    first_photo_subquery(AdType.CAR, CarAd.id),
+)
+_PLATE_LIST_COLUMNS = (
+    PlateAd.id, PlateAd.plate_number, PlateAd.price, PlateAd.city,
+    PlateAd.view_count,
+    first_photo_subquery(AdType.PLATE, PlateAd.id),
+)
+_LIST_TOTAL = func.count().over().label("total")
+
+# Очередь модерации (admin_get_pending): только колонки ответа + обложка
+_PENDING_CAR_ADS = (
+    select(
+        CarAd.id, CarAd.brand, CarAd.model, CarAd.year, CarAd.price, CarAd.city,
+        CarAd.mileage, CarAd.engine_volume, CarAd.fuel_type, CarAd.transmission,
+        CarAd.color, CarAd.description, CarAd.contact_phone, CarAd.contact_telegram,
+        CarAd.created_at, first_photo_subquery(AdType.CAR, CarAd.id),
+    )
+    .where(CarAd.status == AdStatus.PENDING)
+    .order_by(CarAd.created_at, CarAd.id)
+)
+_PENDING_PLATE_ADS = (
+    select(
+        PlateAd.id, PlateAd.plate_number, PlateAd.price, PlateAd.city,
+        PlateAd.description, PlateAd.contact_phone, PlateAd.contact_telegram,
+        PlateAd.created_at, first_photo_subquery(AdType.PLATE, PlateAd.id),
+    )
+    .where(PlateAd.status == AdStatus.PENDING)
+    .order_by(PlateAd.created_at, PlateAd.id)
+)
+# Размер всей очереди модерации (total при постраничной выдаче)
+_PENDING_COUNT = select(
+    select(func.count()).select_from(CarAd)
+    .where(CarAd.status == AdStatus.PENDING).scalar_subquery()
+    + select(func.count()).select_from(PlateAd)
+    .where(PlateAd.status == AdStatus.PENDING).scalar_subquery()
+)
+# Общий порядок очереди модерации: (created_at, тип, id); car раньше plate
+_PENDING_KIND_RANK = {"car": 0, "plate": 1}
 
 # ---------------------------------------------------------------------------
 # Allowed sort options for car and plate listings.
 #
 # Keys are the `sort` query param values accepted by GET /api/cars and
-# GET /api/plates.  Values are *callables* that, given the model class,
-# return an ORDER BY clause element.  Using callables (lambdas) avoids
-# creating SQLAlchemy column expressions at import-time, which keeps the
-# module free of side-effects.
+# GET /api/plates.  Values are ready ORDER BY clause elements — the model
+# columns are bound at import anyway, so the expressions are built once
+# instead of on every request.
 # ---------------------------------------------------------------------------
 _CAR_SORT_OPTIONS: dict[str, object] = {
-    "price_asc":   lambda: CarAd.price.asc(),
-    "price_desc":  lambda: CarAd.price.desc(),
-    "date_new":    lambda: CarAd.created_at.desc(),
-    "date_old":    lambda: CarAd.created_at.asc(),
-    "mileage_asc": lambda: CarAd.mileage.asc(),
+    "price_asc":   CarAd.price.asc(),
+    "price_desc":  CarAd.price.desc(),
+    "date_new":    CarAd.created_at.desc(),
+    "date_old":    CarAd.created_at.asc(),
+    "mileage_asc": CarAd.mileage.asc(),
 }
 
 _PLATE_SORT_OPTIONS: dict[str, object] = {
-    "price_asc":  lambda: PlateAd.price.asc(),
-    "price_desc": lambda: PlateAd.price.desc(),
-    "date_new":   lambda: PlateAd.created_at.desc(),
-    "date_old":   lambda: PlateAd.created_at.asc(),
+    "price_asc":  PlateAd.price.asc(),
+    "price_desc": PlateAd.price.desc(),
+    "date_new":   PlateAd.created_at.desc(),
+    "date_old":   PlateAd.created_at.asc(),
 }
 
 
 def _escape_like(s: str) -> str:
     """Экранировать спецсимволы LIKE/ILIKE: % и _ → \\% и \\_."""
-    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return s.translate(_LIKE_ESCAPE_TABLE)
 
 
 def _safe_int(val, default: int = 0) -> int:
     """Safely convert to int, return default on failure."""
+    if val is None:
+        return default
+    # Быстрый путь для query/match_info: "123" → int без try, "" → default
+    # без исключения. Только ASCII-цифры и не длиннее 18 знаков — int() тут
+    # не может упасть (лимит 4300 цифр). Остальное ("-5", " 7 ", длинные
+    # строки, мусор) — через int() под try.
+    if val.__class__ is str:
+        if val.isascii() and val.isdigit() and len(val) <= 18:
+            return int(val)
+        if not val:
+            return default
     try:
-        return int(val) if val not in (None, "", " ") else default
+        return int(val)
     except (ValueError, TypeError):
         return default
 
 
 def _safe_float(val, default: float = 0.0) -> float:
     """Safely convert to float, return default on failure."""
+    if val is None:
+        return default
+    # "" / " " и прочий мусор — ValueError из float(), отдельная проверка не нужна
     try:
-        return float(val) if val not in (None, "", " ") else default
+        return float(val)
     except (ValueError, TypeError):
         return default
 
 
+def _coarse_utc_now() -> datetime:
+    """Текущее UTC-время с точностью до секунды монотонных часов.
+
+    Для фильтра expires_at > now секундной точности достаточно, а значение
+    переиспользуется всеми запросами в пределах одной секунды.
+    """
+    global _coarse_now_tick, _coarse_now
+    tick = int(time.monotonic())
+    if tick != _coarse_now_tick:
+        _coarse_now_tick = tick
+        _coarse_now = datetime.now(timezone.utc)
+    return _coarse_now
+
+
+def _json_response(data, status: int = 200) -> web.Response:
+    """JSON-ответ через orjson (C-сериализатор, datetime поддерживается нативно)."""
+    return web.Response(
+        body=orjson.dumps(data), status=status, content_type="application/json",
+    )
+
+
+def _make_etag(body: bytes) -> str:
+    """Strong ETag тела ответа (blake2b, 128 бит)."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверить If-None-Match против ETag (weak-сравнение, как требует RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _etag_response(request: web.Request, body: bytes, etag: str | None = None) -> web.Response:
+    """JSON-ответ с ETag; 304 без тела, если у клиента та же версия."""
+    if etag is None:
+        etag = _make_etag(body)
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return web.Response(status=304, headers={"ETag": etag})
+    return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+
+def _static_json(data) -> tuple[bytes, str]:
+    """Сериализовать неизменяемые данные один раз: (JSON-тело, ETag)."""
+    body = orjson.dumps(data)
+    return body, _make_etag(body)
+
+
+# Справочник марок статичен — JSON-тела и ETag'и считаются при импорте.
+_BRAND_NAMES = tuple(BRANDS)
+_BRANDS_BODY, _BRANDS_ETAG = _static_json([
+    {"brand": name, "models": models}
+    for name, models in BRANDS.items()
+])
+_MODELS_BODIES: dict[str, tuple[bytes, str]] = {
+    brand: _static_json(models) for brand, models in BRANDS.items()
+}
+
+
+async def _window_total(
+    session, model_class, filters: list, rows, offset: int, params: dict,
+) -> int:
+    """Достать total из колонки COUNT(*) OVER () страницы листинга.
+
+    Окно пустое, когда offset вышел за пределы выборки — только в этом
+    случае считаем отдельным COUNT-запросом.
+    """
+    if rows:
+        return rows[0].total
+    if not offset:
+        return 0
+    return (await session.execute(
+        select(func.count()).select_from(model_class).where(*filters), params,
+    )).scalar_one()
+
+
+async def _fetch_listing_page(
+    pool, model_class, columns: tuple, filters: list, order_by,
+    offset: int, limit: int, params: dict,
+) -> tuple[list, int]:
+    """Страница каталога и total.
+
+    Без пользовательских фильтров (только статус и срок действия) total
+    берётся из _listing_totals и окно COUNT(*) OVER () не запрашивается.
+    """
+    bare = len(filters) == 2
+    total = _listing_totals.get(model_class) if bare else None
+    stmt = (
+        select(*columns) if total is not None else select(*columns, _LIST_TOTAL)
+    ).where(*filters).order_by(order_by).offset(offset).limit(limit)
+
+    # Сессия держится только на время запросов — сборка ответа идёт
+    # после возврата соединения в пул.
+    async with pool() as session:
+        rows = (await session.execute(stmt, params)).all()
+        if total is None:
+            total = await _window_total(session, model_class, filters, rows, offset, params)
+            if bare:
+                _listing_totals.set(model_class, total)
+    return rows, total
+
+
+async def _fetch_rows(pool, stmt, params: dict | None = None) -> list:
+    """Выполнить запрос в отдельной сессии пула и вернуть все строки.
+
+    Для asyncio.gather независимых запросов: одна AsyncSession не
+    допускает конкурентного использования, поэтому у каждого — своя.
+    """
+    async with pool() as session:
+        return (await session.execute(stmt, params)).all()
+
+
+def _split_user_ads(rows) -> tuple[list[dict], list[dict]]:
+    """Строки _USER_ADS → (cars, plates) для ответа, порядок сохраняется."""
+    cars: list[dict] = []
+    plates: list[dict] = []
+    for row in rows:
+        (cars if row.kind == "car" else plates).append({
+            "id": row.id,
+            "title": row.title,
+            "status": _STATUS_VAL[row.status],
+            "price": row.price,
+            "city": row.city,
+            "photo": row.photo,
+            "created_at": row.created_at,
+        })
+    return cars, plates
+
+
+async def _read_body_limited(request: web.Request, limit: int) -> bytes | None:
+    """Прочитать тело запроса, но не больше limit байт.
+
+    Читает из потока не более limit + 1 байт, так что лишнее не
+    буферизуется. Returns: тело или None, если оно длиннее limit.
+    """
+    body = bytearray()
+    while len(body) <= limit:
+        chunk = await request.content.read(limit + 1 - len(body))
+        if not chunk:
+            break
+        body += chunk
+    if len(body) > limit:
+        return None
+    return bytes(body)
+
+
 async def _on_startup(app: web.Application):
-    """Создать HTTP-клиент для проксирования фото из Telegram."""
-    app["http_client"] = HttpClientSession()
+    """Создать HTTP-клиент для проксирования фото из Telegram.
+
+    Коннектор живёт всё время работы приложения: keep-alive соединения
+    к api.telegram.org переиспользуются без повторного TLS-рукопожатия.
+    """
+    connector = TCPConnector(
+        limit=TG_HTTP_LIMIT,
+        limit_per_host=TG_HTTP_LIMIT_PER_HOST,
+        keepalive_timeout=TG_HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=TG_HTTP_DNS_CACHE_TTL,
+    )
+    app["http_client"] = HttpClientSession(
+        connector=connector,
+        timeout=ClientTimeout(
+            total=None, connect=TG_HTTP_CONNECT_TIMEOUT, sock_read=TG_HTTP_READ_TIMEOUT,
+        ),
+    )
 
 
 async def _on_cleanup(app: web.Application):
-    """Закрыть HTTP-клиент при остановке."""
+    """Дождаться фоновых задач и закрыть HTTP-клиент при остановке."""
+    tasks = app["background_tasks"]
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
     client = app.get("http_client")
     if client:
         await client.close()
 
 
+def _spawn_background(app: web.Application, coro) -> asyncio.Task:
+    """Запустить корутину фоном, не дожидаясь её в обработчике.
+
+    Ссылка на задачу хранится в app["background_tasks"] до завершения —
+    иначе её может собрать GC. Ошибки корутина логирует сама.
+    """
+    task = asyncio.create_task(coro)
+    tasks = app["background_tasks"]
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+    return task
+
+
 def create_api_app(
     session_pool: async_sessionmaker, bot_token: str, bot=None, storage=None,
+    read_session_pool: async_sessionmaker | None = None,
 ) -> web.Application:
-    """Create aiohttp app with API routes."""
+    """Create aiohttp app with API routes.
+
+    read_session_pool — фабрика AUTOCOMMIT-сессий для обработчиков, которые
+    только читают (без BEGIN/COMMIT); по умолчанию — session_pool.
+    """
     app = web.Application(
-        middlewares=[cors_middleware],
+        middlewares=[cors_middleware, db_pool_timeout_middleware],
         client_max_size=10 * 1024 * 1024,  # 10MB для multipart загрузок фото
     )
     app["session_pool"] = session_pool
+    app["read_pool"] = read_session_pool or session_pool
     app["bot_token"] = bot_token
+    app["background_tasks"] = set()  # см. _spawn_background
     if bot:
         app["bot"] = bot
     if storage:
@@ -171,6 +581,8 @@ def create_api_app(
     # Lifecycle hooks для HTTP-клиента
     app.on_startup.append(_on_startup)
     app.on_cleanup.append(_on_cleanup)
+    # CORS-заголовки — до отправки заголовков любого ответа
+    app.on_response_prepare.append(_on_response_prepare)
 
     # Auth endpoint
     app.router.add_get("/api/me", get_me)
@@ -250,9 +662,11 @@ def _check_admin_access(request: web.Request) -> bool:
         if hmac.compare_digest(token, settings.admin_token):
             return True
 
+    if not _ADMIN_IDS:
+        return False
+
     # Способ 2: validated initData
-    user_id = get_authenticated_user(request)
-    if user_id and settings.admin_ids and user_id in settings.admin_ids:
+    if get_authenticated_user(request) in _ADMIN_IDS:
         return True
 
     # Способ 3: legacy fallback (query param) — TODO: remove
@@ -260,41 +674,46 @@ def _check_admin_access(request: web.Request) -> bool:
         request.query.get("user_id")
         or request.headers.get("X-Telegram-User-Id")
     )
-    if user_id_str and settings.admin_ids:
-        try:
-            uid = int(user_id_str)
-            if uid in settings.admin_ids:
-                return True
-        except (ValueError, TypeError):
-            pass
-
-    return False
+    return _safe_int(user_id_str, 0) in _ADMIN_IDS
 
 
 @web.middleware
 async def cors_middleware(request: web.Request, handler):
-    """Add CORS headers to all responses.
+    """Answer CORS preflight without calling the handler.
+
+    Сами CORS-заголовки ставит _on_response_prepare — в т.ч. для
+    потоковых ответов, заголовки которых уже отправлены к моменту
+    возврата из обработчика.
+    """
+    if request.method == "OPTIONS":
+        return web.Response()
+    return await handler(request)
+
+
+async def _on_response_prepare(request: web.Request, response: web.StreamResponse):
+    """Add CORS headers to every response before its headers are sent.
 
     Allows GET, POST, PUT, DELETE, OPTIONS for cross-origin requests
     from the Mini App frontend.
     """
-    if request.method == "OPTIONS":
-        response = web.Response()
-    else:
-        response = await handler(request)
-    # Ограничиваем CORS: только разрешённые origin'ы
+    response.headers.update(_CORS_HEADERS)
+    # Ограничиваем CORS: только разрешённые origin'ы (+ localhost для разработки)
     origin = request.headers.get("Origin", "")
-    allowed_origins = {"https://auto.xlmmama.ru"}
-    if origin in allowed_origins:
+    if origin in _ALLOWED_ORIGINS or _dev_origin_match(origin):
         response.headers["Access-Control-Allow-Origin"] = origin
-    else:
-        # Для локальной разработки (localhost)
-        if origin.startswith("http://localhost") or origin.startswith("http://127.0.0.1"):
-            response.headers["Access-Control-Allow-Origin"] = origin
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, X-Telegram-User-Id, X-Telegram-Init-Data"
-    response.headers["Access-Control-Expose-Headers"] = "X-Telegram-User-Id"
-    return response
+
+
+@web.middleware
+async def db_pool_timeout_middleware(request: web.Request, handler):
+    """Пул соединений исчерпан (pool_timeout) → 503 вместо 500.
+
+    Клиент может повторить запрос позже; в лог — предупреждение, не трейс.
+    """
+    try:
+        return await handler(request)
+    except SATimeoutError:
+        logger.warning("DB pool exhausted: %s %s", request.method, request.path)
+        raise web.HTTPServiceUnavailable(text="Service temporarily overloaded")
 
 
 async def get_me(request: web.Request) -> web.Response:
@@ -304,40 +723,40 @@ async def get_me(request: web.Request) -> web.Response:
     """
     user_id = get_authenticated_user_or_fallback(request)
     if not user_id:
-        return web.json_response({"error": "Not authenticated"}, status=401)
+        return _json_response({"error": "Not authenticated"}, status=401)
 
-    is_admin = bool(settings.admin_ids and user_id in settings.admin_ids)
-    return web.json_response({"user_id": user_id, "is_admin": is_admin})
+    is_admin = user_id in _ADMIN_IDS
+    return _json_response({"user_id": user_id, "is_admin": is_admin})
 
 
-async def check_ad_ownership(session, ad, user_id_tg: int) -> bool:
-    """Check if user_id_tg is the owner of the ad.
+async def _get_ad_with_owner(session, model_class, ad_id: int):
+    """Загрузить объявление вместе с telegram_id владельца одним JOIN.
 
-    Loads the owner User by ad.user_id and compares telegram_id.
-    Returns True if owner matches, False otherwise.
+    Returns:
+        (ad, owner_telegram_id) или (None, None), если объявление не найдено.
     """
-    owner = (await session.execute(
-        select(User).where(User.id == ad.user_id)
-    )).scalar_one_or_none()
-    return bool(owner and owner.telegram_id == user_id_tg)
+    row = (await session.execute(
+        select(model_class, User.telegram_id)
+        .join(User, User.id == model_class.user_id)
+        .where(model_class.id == ad_id)
+    )).one_or_none()
+    if row is None:
+        return None, None
+    return row[0], row[1]
 
 
 async def get_brands(request: web.Request) -> web.Response:
     """GET /api/brands — fixed list of all brands with their models."""
-    brands = [
-        {"brand": name, "models": models}
-        for name, models in BRANDS.items()
-    ]
-    return web.json_response(brands)
+    return _etag_response(request, _BRANDS_BODY, _BRANDS_ETAG)
 
 
 async def get_models(request: web.Request) -> web.Response:
     """GET /api/brands/{brand}/models — models for a specific brand (static)."""
     brand = request.match_info["brand"]
-    models = BRANDS.get(brand)
-    if models is None:
+    cached = _MODELS_BODIES.get(brand)
+    if cached is None:
         raise web.HTTPNotFound(text=f"Brand '{brand}' not found")
-    return web.json_response(models)
+    return _etag_response(request, *cached)
 
 
 async def get_car_ads(request: web.Request) -> web.Response:
@@ -353,7 +772,7 @@ async def get_car_ads(request: web.Request) -> web.Response:
       offset — pagination offset (default 0)
       limit  — page size, capped at 50 (default 20)
     """
-    pool = request.app["session_pool"]
+    pool = request.app["read_pool"]
     brand = request.query.get("brand")
     model = request.query.get("model")
     city = request.query.get("city")
@@ -368,87 +787,64 @@ async def get_car_ads(request: web.Request) -> web.Response:
     year_min = _safe_int(request.query.get("year_min"), 0)
     year_max = _safe_int(request.query.get("year_max"), 0)
 
-    async with pool() as session:
-        stmt = select(CarAd).where(CarAd.status == AdStatus.APPROVED)
-        count_stmt = select(func.count()).select_from(CarAd).where(CarAd.status == AdStatus.APPROVED)
-
-        # ── Исключить просроченные (expires_at заполнен и в прошлом) ──
-        now = datetime.now(timezone.utc)
-        expired_filter = or_(CarAd.expires_at.is_(None), CarAd.expires_at > now)
-        stmt = stmt.where(expired_filter)
-        count_stmt = count_stmt.where(expired_filter)
-
-        # ── Фильтры по цене и году ────────────────────────────────
-        if price_min > 0:
-            stmt = stmt.where(CarAd.price >= price_min)
-            count_stmt = count_stmt.where(CarAd.price >= price_min)
-        if price_max > 0:
-            stmt = stmt.where(CarAd.price <= price_max)
-            count_stmt = count_stmt.where(CarAd.price <= price_max)
-        if year_min > 0:
-            stmt = stmt.where(CarAd.year >= year_min)
-            count_stmt = count_stmt.where(CarAd.year >= year_min)
-        if year_max > 0:
-            stmt = stmt.where(CarAd.year <= year_max)
-            count_stmt = count_stmt.where(CarAd.year <= year_max)
-
-        # ── Exact filters ──────────────────────────────────────────
-        if brand:
-            stmt = stmt.where(CarAd.brand == brand)
-            count_stmt = count_stmt.where(CarAd.brand == brand)
-        if model:
-            stmt = stmt.where(CarAd.model == model)
-            count_stmt = count_stmt.where(CarAd.model == model)
-        if city:
-            stmt = stmt.where(CarAd.city == city)
-            count_stmt = count_stmt.where(CarAd.city == city)
-
-        # ── Search (q) — ILIKE по brand, model, description (OR) ──
-        # Позволяет пользователю искать "BMW" и найти по марке/модели/описанию.
-        if q:
-            q_escaped = _escape_like(q)
-            q_pattern = f"%{q_escaped}%"
-            search_filter = or_(
-                CarAd.brand.ilike(q_pattern),
-                CarAd.model.ilike(q_pattern),
-                CarAd.description.ilike(q_pattern),
-            )
-            stmt = stmt.where(search_filter)
-            count_stmt = count_stmt.where(search_filter)
-
-        # ── Sort ───────────────────────────────────────────────────
-        # Если sort не указан или невалидный — используем date_new (новые первыми).
-        sort_fn = _CAR_SORT_OPTIONS.get(sort, _CAR_SORT_OPTIONS["date_new"])
-        stmt = stmt.order_by(sort_fn())
-
-        total = (await session.execute(count_stmt)).scalar_one()
-        ads = (
-            await session.execute(stmt.offset(offset).limit(limit))
-        ).scalars().all()
-
-        # Get first photo for each ad
-        ad_ids = [ad.id for ad in ads]
-        photos_map = await load_first_photos_map(session, AdType.CAR, ad_ids)
+    # ── Исключить просроченные (expires_at заполнен и в прошлом) ──
+    params = {"now_ts": _coarse_utc_now()}
+    filters = [CarAd.status == AdStatus.APPROVED, _CAR_NOT_EXPIRED]
+
+    # ── Фильтры по цене и году ────────────────────────────────
+    if price_min > 0:
+        filters.append(CarAd.price >= price_min)
+    if price_max > 0:
+        filters.append(CarAd.price <= price_max)
+    if year_min > 0:
+        filters.append(CarAd.year >= year_min)
+    if year_max > 0:
+        filters.append(CarAd.year <= year_max)
+
+    # ── Exact filters ──────────────────────────────────────────
+    if brand:
+        filters.append(CarAd.brand == brand)
+    if model:
+        filters.append(CarAd.model == model)
+    if city:
+        filters.append(CarAd.city == city)
+
+    # ── Search (q) — ILIKE по склейке brand, model, description ──
+    # Позволяет пользователю искать "BMW" и найти по марке/модели/описанию.
+    # Одно выражение под триграммный индекс (см. CAR_SEARCH_TEXT).
+    if q:
+        q_escaped = _escape_like(q)
+        q_pattern = f"%{q_escaped}%"
+        filters.append(CAR_SEARCH_TEXT.ilike(q_pattern))
+
+    # ── Sort ───────────────────────────────────────────────────
+    # Если sort не указан или невалидный — используем date_new (новые первыми).
+    order_by = _CAR_SORT_OPTIONS.get(sort, _CAR_SORT_OPTIONS["date_new"])
+
+    # Список, total и фото за один round trip
+    rows, total = await _fetch_listing_page(
+        pool, CarAd, _CAR_LIST_COLUMNS, filters, order_by, offset, limit, params,
+    )
 
-        items = [
-            {
-                "id": ad.id,
-                "brand": ad.brand,
-                "model": ad.model,
-                "year": ad.year,
-                "price": ad.price,
-                "city": ad.city,
-                "mileage": ad.mileage,
-                "fuel_type": ad.fuel_type.value,
-                "transmission": ad.transmission.value,
-                "photo": photos_map.get(ad.id),
-                "view_count": ad.view_count or 0,
-            }
-            for ad in ads
-        ]
+    items = [
+        {
+            "id": row.id,
+            "brand": row.brand,
+            "model": row.model,
+            "year": row.year,
+            "price": row.price,
+            "city": row.city,
+            "mileage": row.mileage,
+            "fuel_type": _FUEL_VAL[row.fuel_type],
+            "transmission": _TRANS_VAL[row.transmission],
+            "photo": row.photo,
+            "view_count": row.view_count or 0,
+        }
+        for row in rows
+    ]
 
     # TODO F15: Добавить has_more в пагинацию (total > offset + limit)
-    return web.json_response({"items": items, "total": total})
+    return _json_response({"items": items, "total": total})
 
 
 async def get_car_ad(request: web.Request) -> web.Response:
@@ -463,13 +859,18 @@ async def get_car_ad(request: web.Request) -> web.Response:
 
     async with pool() as session:
         # F16: Исключить просроченные объявления
-        now = datetime.now(timezone.utc)
-        stmt = select(CarAd).where(
-            CarAd.id == ad_id,
-            CarAd.status == AdStatus.APPROVED,
-            or_(CarAd.expires_at.is_(None), CarAd.expires_at > now),
+        stmt = (
+            select(CarAd)
+            .where(
+                CarAd.id == ad_id,
+                CarAd.status == AdStatus.APPROVED,
+                _CAR_NOT_EXPIRED,
+            )
+            .options(selectinload(CarAd.photos))
         )
-        ad = (await session.execute(stmt)).scalar_one_or_none()
+        ad = (await session.execute(
+            stmt, {"now_ts": _coarse_utc_now()},
+        )).scalar_one_or_none()
         if not ad:
             raise web.HTTPNotFound()
 
@@ -477,19 +878,8 @@ async def get_car_ad(request: web.Request) -> web.Response:
         if await record_unique_view(session, viewer_id, AdType.CAR, ad_id, ad):
             await session.commit()
 
-        photo_stmt = (
-            select(AdPhoto)
-            .where(AdPhoto.ad_type == AdType.CAR, AdPhoto.ad_id == ad_id)
-            .order_by(AdPhoto.position)
-        )
-        photos = (await session.execute(photo_stmt)).scalars().all()
-
-        # Подгружаем автора + считаем его активные объявления
-        author = (await session.execute(
-            select(User).where(User.id == ad.user_id)
-        )).scalar_one_or_none()
-
-        author_ads_count = await get_user_active_ads_count(session, author.id) if author else 0
+        # Подгружаем автора + его активные объявления одним запросом
+        author, author_ads_count = await get_author_with_ads_count(session, ad.user_id)
 
         data = {
             "id": ad.id,
@@ -512,12 +902,12 @@ async def get_car_ad(request: web.Request) -> web.Response:
             "author_name": author.full_name if author else None,
             "author_since": author.created_at.strftime("%d.%m.%Y") if author and author.created_at else None,
             "author_ads_count": author_ads_count,
-            "photos": [p.file_id for p in photos],
-            "created_at": ad.created_at.isoformat() if ad.created_at else None,
+            "photos": [p.file_id for p in ad.photos],
+            "created_at": ad.created_at,
             "view_count": ad.view_count,
         }
 
-    return web.json_response(data)
+    return _etag_response(request, orjson.dumps(data))
 
 
 async def get_plate_ads(request: web.Request) -> web.Response:
@@ -530,7 +920,7 @@ async def get_plate_ads(request: web.Request) -> web.Response:
       offset — pagination offset (default 0)
       limit  — page size, capped at 50 (default 20)
     """
-    pool = request.app["session_pool"]
+    pool = request.app["read_pool"]
     city = request.query.get("city")
     q = request.query.get("q")          # full-text-like search term
     sort = request.query.get("sort")    # sort option key
@@ -541,67 +931,48 @@ async def get_plate_ads(request: web.Request) -> web.Response:
     price_min = _safe_int(request.query.get("price_min"), 0)
     price_max = _safe_int(request.query.get("price_max"), 0)
 
-    async with pool() as session:
-        stmt = select(PlateAd).where(PlateAd.status == AdStatus.APPROVED)
-        count_stmt = select(func.count()).select_from(PlateAd).where(PlateAd.status == AdStatus.APPROVED)
-
-        # ── Исключить просроченные (expires_at заполнен и в прошлом) ──
-        now = datetime.now(timezone.utc)
-        expired_filter = or_(PlateAd.expires_at.is_(None), PlateAd.expires_at > now)
-        stmt = stmt.where(expired_filter)
-        count_stmt = count_stmt.where(expired_filter)
-
-        # ── Фильтры по цене ───────────────────────────────────────
-        if price_min > 0:
-            stmt = stmt.where(PlateAd.price >= price_min)
-            count_stmt = count_stmt.where(PlateAd.price >= price_min)
-        if price_max > 0:
-            stmt = stmt.where(PlateAd.price <= price_max)
-            count_stmt = count_stmt.where(PlateAd.price <= price_max)
-
-        # ── Exact filters ──────────────────────────────────────────
-        if city:
-            stmt = stmt.where(PlateAd.city == city)
-            count_stmt = count_stmt.where(PlateAd.city == city)
-
-        # ── Search (q) — ILIKE по plate_number, description (OR) ──
-        if q:
-            q_escaped = _escape_like(q)
-            q_pattern = f"%{q_escaped}%"
-            search_filter = or_(
-                PlateAd.plate_number.ilike(q_pattern),
-                PlateAd.description.ilike(q_pattern),
-            )
-            stmt = stmt.where(search_filter)
-            count_stmt = count_stmt.where(search_filter)
-
-        # ── Sort ───────────────────────────────────────────────────
-        # mileage_asc не применим к номерам — при невалидном sort используем date_new.
-        sort_fn = _PLATE_SORT_OPTIONS.get(sort, _PLATE_SORT_OPTIONS["date_new"])
-        stmt = stmt.order_by(sort_fn())
-
-        total = (await session.execute(count_stmt)).scalar_one()
-        ads = (
-            await session.execute(stmt.offset(offset).limit(limit))
-        ).scalars().all()
-
-        # Photos
-        ad_ids = [ad.id for ad in ads]
-        photos_map = await load_first_photos_map(session, AdType.PLATE, ad_ids)
+    # ── Исключить просроченные (expires_at заполнен и в прошлом) ──
+    params = {"now_ts": _coarse_utc_now()}
+    filters = [PlateAd.status == AdStatus.APPROVED, _PLATE_NOT_EXPIRED]
+
+    # ── Фильтры по цене ───────────────────────────────────────
+    if price_min > 0:
+        filters.append(PlateAd.price >= price_min)
+    if price_max > 0:
+        filters.append(PlateAd.price <= price_max)
+
+    # ── Exact filters ──────────────────────────────────────────
+    if city:
+        filters.append(PlateAd.city == city)
+
+    # ── Search (q) — ILIKE по склейке plate_number, description ──
+    if q:
+        q_escaped = _escape_like(q)
+        q_pattern = f"%{q_escaped}%"
+        filters.append(PLATE_SEARCH_TEXT.ilike(q_pattern))
+
+    # ── Sort ───────────────────────────────────────────────────
+    # mileage_asc не применим к номерам — при невалидном sort используем date_new.
+    order_by = _PLATE_SORT_OPTIONS.get(sort, _PLATE_SORT_OPTIONS["date_new"])
+
+    # Список, total и фото за один round trip
+    rows, total = await _fetch_listing_page(
+        pool, PlateAd, _PLATE_LIST_COLUMNS, filters, order_by, offset, limit, params,
+    )
 
-        items = [
-            {
-                "id": ad.id,
-                "plate_number": ad.plate_number,
-                "price": ad.price,
-                "city": ad.city,
-                "photo": photos_map.get(ad.id),
-                "view_count": ad.view_count or 0,
-            }
-            for ad in ads
-        ]
+    items = [
+        {
+            "id": row.id,
+            "plate_number": row.plate_number,
+            "price": row.price,
+            "city": row.city,
+            "photo": row.photo,
+            "view_count": row.view_count or 0,
+        }
+        for row in rows
+    ]
 
-    return web.json_response({"items": items, "total": total})
+    return _json_response({"items": items, "total": total})
 
 
 async def get_plate_ad_detail(request: web.Request) -> web.Response:
@@ -616,13 +987,18 @@ async def get_plate_ad_detail(request: web.Request) -> web.Response:
 
     async with pool() as session:
         # F16: Исключить просроченные объявления
-        now = datetime.now(timezone.utc)
-        stmt = select(PlateAd).where(
-            PlateAd.id == ad_id,
-            PlateAd.status == AdStatus.APPROVED,
-            or_(PlateAd.expires_at.is_(None), PlateAd.expires_at > now),
+        stmt = (
+            select(PlateAd)
+            .where(
+                PlateAd.id == ad_id,
+                PlateAd.status == AdStatus.APPROVED,
+                _PLATE_NOT_EXPIRED,
+            )
+            .options(selectinload(PlateAd.photos))
         )
-        ad = (await session.execute(stmt)).scalar_one_or_none()
+        ad = (await session.execute(
+            stmt, {"now_ts": _coarse_utc_now()},
+        )).scalar_one_or_none()
         if not ad:
             raise web.HTTPNotFound()
 
@@ -630,19 +1006,8 @@ async def get_plate_ad_detail(request: web.Request) -> web.Response:
         if await record_unique_view(session, viewer_id, AdType.PLATE, ad_id, ad):
             await session.commit()
 
-        photo_stmt = (
-            select(AdPhoto)
-            .where(AdPhoto.ad_type == AdType.PLATE, AdPhoto.ad_id == ad_id)
-            .order_by(AdPhoto.position)
-        )
-        photos = (await session.execute(photo_stmt)).scalars().all()
-
-        # Подгружаем автора + считаем его активные объявления
-        author = (await session.execute(
-            select(User).where(User.id == ad.user_id)
-        )).scalar_one_or_none()
-
-        author_ads_count = await get_user_active_ads_count(session, author.id) if author else 0
+        # Подгружаем автора + его активные объявления одним запросом
+        author, author_ads_count = await get_author_with_ads_count(session, ad.user_id)
 
         data = {
             "id": ad.id,
@@ -657,50 +1022,53 @@ async def get_plate_ad_detail(request: web.Request) -> web.Response:
             "author_name": author.full_name if author else None,
             "author_since": author.created_at.strftime("%d.%m.%Y") if author and author.created_at else None,
             "author_ads_count": author_ads_count,
-            "photos": [p.file_id for p in photos],
-            "created_at": ad.created_at.isoformat() if ad.created_at else None,
+            "photos": [p.file_id for p in ad.photos],
+            "created_at": ad.created_at,
             "view_count": ad.view_count,
         }
 
-    return web.json_response(data)
+    return _etag_response(request, orjson.dumps(data))
 
 
 async def get_cities(request: web.Request) -> web.Response:
-    """GET /api/cities — cities with approved ads."""
-    pool = request.app["session_pool"]
-    async with pool() as session:
-        # Combine cities from both ad types
-        car_cities = (
-            await session.execute(
-                select(CarAd.city, func.count().label("c"))
-                .where(CarAd.status == AdStatus.APPROVED)
-                .group_by(CarAd.city)
-            )
-        ).all()
-
-        plate_cities = (
-            await session.execute(
-                select(PlateAd.city, func.count().label("c"))
-                .where(PlateAd.status == AdStatus.APPROVED)
-                .group_by(PlateAd.city)
-            )
-        ).all()
+    """GET /api/cities — cities with approved ads.
 
-        city_counts: dict[str, int] = {}
-        for city, count in car_cities:
-            city_counts[city] = city_counts.get(city, 0) + count
-        for city, count in plate_cities:
-            city_counts[city] = city_counts.get(city, 0) + count
+    Агрегат меняется редко — тело ответа кешируется на CITIES_CACHE_TTL.
+    """
+    cached = _cities_cache.get("cities")
+    if cached is not None:
+        return _etag_response(request, *cached)
+
+    pool = request.app["read_pool"]
+
+    # Агрегация по обоим типам объявлений в одном запросе:
+    # UNION ALL двух GROUP BY + внешний SUM по городу.
+    per_type = union_all(
+        select(CarAd.city, func.count().label("c"))
+        .where(CarAd.status == AdStatus.APPROVED)
+        .group_by(CarAd.city),
+        select(PlateAd.city, func.count().label("c"))
+        .where(PlateAd.status == AdStatus.APPROVED)
+        .group_by(PlateAd.city),
+    ).subquery()
+    stmt = (
+        # SUM(bigint) в Postgres — numeric; приводим обратно к целому
+        select(per_type.c.city, func.sum(per_type.c.c).cast(BigInteger).label("c"))
+        .group_by(per_type.c.city)
+        .order_by(per_type.c.city)
+    )
 
-        cities = [
-            {"city": city, "count": count}
-            for city, count in sorted(city_counts.items())
-        ]
+    async with pool() as session:
+        rows = (await session.execute(stmt)).all()
 
-    return web.json_response(cities)
+    cities = [{"city": city, "count": count} for city, count in rows]
+    body = orjson.dumps(cities)
+    etag = _make_etag(body)
+    _cities_cache.set("cities", (body, etag))
+    return _etag_response(request, body, etag)
 
 
-async def proxy_photo(request: web.Request) -> web.Response:
+async def proxy_photo(request: web.Request) -> web.StreamResponse:
     """GET /api/photos/{file_id} — serve photo (local or Telegram proxy).
 
     Сначала проверяет, является ли file_id локальным (loc_*).
@@ -710,9 +1078,15 @@ async def proxy_photo(request: web.Request) -> web.Response:
     file_id = request.match_info["file_id"]
 
     # Sanitize file_id: only alphanumeric, underscores, dashes allowed
-    if not _FILE_ID_RE.match(file_id) or len(file_id) > 256:
+    if not _file_id_match(file_id) or len(file_id) > 256:
         raise web.HTTPBadRequest(text="Invalid file_id")
 
+    # file_id неизменяем (фото под ним не меняется) — он же ETag.
+    # Повторная валидация WebView → 304 без чтения файла и похода в Telegram.
+    etag = f'"{file_id}"'
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return web.Response(status=304, headers={**_PHOTO_FILE_HEADERS, "ETag": etag})
+
     # Проверяем, не локальное ли фото (загруженное через Mini App)
     if is_local_photo(file_id):
         path = get_photo_path(file_id)
@@ -721,95 +1095,202 @@ async def proxy_photo(request: web.Request) -> web.Response:
         content_type = mimetypes.guess_type(str(path))[0] or "image/jpeg"
         return web.FileResponse(
             path,
-            headers={
-                "Cache-Control": "public, max-age=86400",
-                "Content-Type": content_type,
-            },
+            headers={**_PHOTO_FILE_HEADERS, "Content-Type": content_type},
+        )
+
+    # Telegram-фото уже в дисковом кеше — отдаём как файл (с поддержкой Range)
+    cached_path = await asyncio.to_thread(get_tg_cache_path, file_id)
+    if cached_path is not None:
+        return web.FileResponse(
+            cached_path,
+            headers={**_PHOTO_FILE_HEADERS, "Content-Type": "image/jpeg"},
         )
 
     # Telegram photo proxy — переиспользуем app-level HTTP-клиент
     bot_token = request.app["bot_token"]
     client = request.app["http_client"]
-    api_url = f"https://api.telegram.org/bot{bot_token}/getFile?file_id={file_id}"
-
-    async with client.get(api_url) as resp:
-        if resp.status != 200:
+    path_was_cached = _tg_file_paths.get(file_id) is not None
+    file_path = await _get_telegram_file_path(client, bot_token, file_id)
+    if file_path is None:
+        raise web.HTTPNotFound()
+
+    # Стримим тело чанками, не буферизуя фото целиком в памяти.
+    # Range / If-Modified-Since клиента пробрасываем в Telegram.
+    upstream_headers = {
+        name: request.headers[name]
+        for name in _PROXY_REQUEST_HEADERS
+        if name in request.headers
+    }
+    download_url = f"https://api.telegram.org/file/bot{bot_token}/{file_path}"
+    resp = await client.get(download_url, headers=upstream_headers)
+    if resp.status in (401, 404) and path_was_cached:
+        # file_path из кеша устарел — сбросить и один раз запросить getFile заново
+        resp.release()
+        _tg_file_paths.pop(file_id)
+        file_path = await _get_telegram_file_path(client, bot_token, file_id)
+        if file_path is None:
             raise web.HTTPNotFound()
-        data = await resp.json()
-        if not data.get("ok"):
+        download_url = f"https://api.telegram.org/file/bot{bot_token}/{file_path}"
+        resp = await client.get(download_url, headers=upstream_headers)
+
+    async with resp:
+        if resp.status == 304:
+            return web.Response(status=304)
+        if resp.status not in (200, 206):
             raise web.HTTPNotFound()
-        file_path = data["result"]["file_path"]
 
-    download_url = f"https://api.telegram.org/file/bot{bot_token}/{file_path}"
-    async with client.get(download_url) as resp:
+        response = web.StreamResponse(
+            status=resp.status,
+            headers={"Cache-Control": f"public, max-age={PHOTO_CACHE_MAX_AGE}", "ETag": etag},
+        )
+        response.content_type = resp.headers.get("Content-Type", "image/jpeg")
+        for name in _PROXY_RESPONSE_HEADERS:
+            if name in resp.headers:
+                response.headers[name] = resp.headers[name]
+        if resp.content_length is not None and "Content-Encoding" not in resp.headers:
+            response.content_length = resp.content_length
+
+        # Полный ответ (не Range) параллельно пишем во временный файл
+        # дискового кеша — порциями, запись в потоке, без буфера в памяти
+        cache_tmp = None
+        if resp.status == 200:
+            cache_tmp = await asyncio.to_thread(open_tg_cache_tempfile, PHOTO_PROXY_CHUNK_SIZE)
+        try:
+            await response.prepare(request)
+            size = 0
+            async for chunk in resp.content.iter_chunked(PHOTO_PROXY_CHUNK_SIZE):
+                await response.write(chunk)
+                if cache_tmp is None:
+                    continue
+                size += len(chunk)
+                try:
+                    if size > MAX_PHOTO_SIZE:
+                        raise ValueError(f"File too large: > {MAX_PHOTO_SIZE} bytes")
+                    await asyncio.to_thread(cache_tmp.write, chunk)
+                except (OSError, ValueError) as e:
+                    logger.warning("Failed to cache Telegram photo %s: %s", file_id, e)
+                    await asyncio.to_thread(_discard_tempfile, cache_tmp)
+                    cache_tmp = None
+            await response.write_eof()
+
+            if cache_tmp is not None:
+                try:
+                    await asyncio.to_thread(cache_tmp.close)
+                    await asyncio.to_thread(save_tg_cache_from_path, cache_tmp.name, file_id)
+                    cache_tmp = None
+                    _maybe_prune_tg_cache(request.app)
+                except (OSError, ValueError) as e:
+                    logger.warning("Failed to cache Telegram photo %s: %s", file_id, e)
+        finally:
+            # Недописанный (обрыв, ошибка) или не перенесённый файл — удалить
+            if cache_tmp is not None:
+                await asyncio.to_thread(_discard_tempfile, cache_tmp)
+
+    return response
+
+
+def _discard_tempfile(tmp) -> None:
+    """Закрыть и удалить временный файл (если он ещё не перенесён)."""
+    tmp.close()
+    discard_upload_tempfile(tmp.name)
+
+
+def _maybe_prune_tg_cache(app: web.Application) -> None:
+    """Фоном ужать дисковый кеш Telegram-фото до TG_CACHE_MAX_BYTES.
+
+    Обход каталога — не чаще раза в TG_CACHE_PRUNE_INTERVAL.
+    """
+    global _tg_cache_pruned_at
+    now = time.monotonic()
+    if now - _tg_cache_pruned_at < TG_CACHE_PRUNE_INTERVAL:
+        return
+    _tg_cache_pruned_at = now
+    _spawn_background(app, _prune_tg_cache())
+
+
+async def _prune_tg_cache() -> None:
+    """prune_tg_cache в потоке; ошибки — в лог."""
+    try:
+        removed = await asyncio.to_thread(prune_tg_cache, TG_CACHE_MAX_BYTES)
+    except OSError as e:
+        logger.warning("Failed to prune Telegram photo cache: %s", e)
+        return
+    if removed:
+        logger.info("Pruned %d files from Telegram photo cache", removed)
+
+
+async def _get_telegram_file_path(client, bot_token: str, file_id: str) -> str | None:
+    """file_path для file_id через Bot API getFile (с TTL-кешем)."""
+    file_path = _tg_file_paths.get(file_id)
+    if file_path is not None:
+        return file_path
+
+    api_url = f"https://api.telegram.org/bot{bot_token}/getFile?file_id={file_id}"
+    async with client.get(api_url) as resp:
         if resp.status != 200:
-            raise web.HTTPNotFound()
-        content = await resp.read()
-        content_type_header = resp.headers.get("Content-Type", "image/jpeg")
+            return None
+        data = await resp.json()
+    if not data.get("ok"):
+        return None
 
-    return web.Response(
-        body=content,
-        content_type=content_type_header,
-        headers={"Cache-Control": "public, max-age=86400"},
-    )
+    file_path = data["result"]["file_path"]
+    _tg_file_paths.set(file_id, file_path)
+    return file_path
 
 
 # --- Profile endpoint ---
 
 
 async def get_profile(request: web.Request) -> web.Response:
-    """GET /api/profile/{telegram_id} — user profile with ad stats."""
+    """GET /api/profile/{telegram_id} — user profile with ad stats.
+
+    Ответ кешируется на PROFILE_CACHE_TTL; кеш пользователя сбрасывается
+    (invalidate_profile) при изменении профиля и его объявлений — через API
+    и через бота (подача, модерация).
+    """
     telegram_id = _safe_int(request.match_info.get("telegram_id"), 0)
     if not telegram_id:
-        return web.json_response({"error": "Invalid telegram_id"}, status=400)
+        return _json_response({"error": "Invalid telegram_id"}, status=400)
 
-    pool = request.app["session_pool"]
-    async with pool() as session:
-        user_stmt = select(User).where(User.telegram_id == telegram_id)
-        user = (await session.execute(user_stmt)).scalar_one_or_none()
+    cached = profile_cache.get(telegram_id)
+    if cached is not None:
+        return web.Response(body=cached, content_type="application/json")
 
-        if not user:
-            return web.json_response({
-                "name": "Пользователь",
-                "username": None,
-                "ads": {"total": 0, "active": 0, "pending": 0, "rejected": 0},
-            })
+    pool = request.app["read_pool"]
+    async with pool() as session:
+        row = (await session.execute(_PROFILE, {"tg": telegram_id})).one_or_none()
 
-        # Count ads by status
-        car_counts = {}
-        plate_counts = {}
-        for label, status in [
-            ("active", AdStatus.APPROVED),
-            ("pending", AdStatus.PENDING),
-            ("rejected", AdStatus.REJECTED),
-        ]:
-            cc = (await session.execute(
-                select(func.count()).select_from(CarAd)
-                .where(CarAd.user_id == user.id, CarAd.status == status)
-            )).scalar_one()
-            pc = (await session.execute(
-                select(func.count()).select_from(PlateAd)
-                .where(PlateAd.user_id == user.id, PlateAd.status == status)
-            )).scalar_one()
-            car_counts[label] = cc
-            plate_counts[label] = pc
-
-        total = sum(car_counts.values()) + sum(plate_counts.values())
-
-        return web.json_response({
-            "name": user.full_name,
-            "username": user.username,
-            "member_since": user.created_at.strftime("%d.%m.%Y") if user.created_at else None,
-            "ads": {
-                "total": total,
-                "active": car_counts["active"] + plate_counts["active"],
-                "pending": car_counts["pending"] + plate_counts["pending"],
-                "rejected": car_counts["rejected"] + plate_counts["rejected"],
-                "cars": sum(car_counts.values()),
-                "plates": sum(plate_counts.values()),
-            },
+    if row is None:
+        return _json_response({
+            "name": "Пользователь",
+            "username": None,
+            "ads": {"total": 0, "active": 0, "pending": 0, "rejected": 0},
         })
 
+    # Счётчики по статусам (SOLD в профиле не считается)
+    counts = row._mapping
+    car_counts = {label: counts[f"car_{label}"] for label in _STATUS_LABELS.values()}
+    plate_counts = {label: counts[f"plate_{label}"] for label in _STATUS_LABELS.values()}
+    cars = sum(car_counts.values())
+    plates = sum(plate_counts.values())
+
+    body = orjson.dumps({
+        "name": row.full_name,
+        "username": row.username,
+        "member_since": row.created_at.strftime("%d.%m.%Y") if row.created_at else None,
+        "ads": {
+            "total": cars + plates,
+            "active": car_counts["active"] + plate_counts["active"],
+            "pending": car_counts["pending"] + plate_counts["pending"],
+            "rejected": car_counts["rejected"] + plate_counts["rejected"],
+            "cars": cars,
+            "plates": plates,
+        },
+    })
+
+    profile_cache.set(telegram_id, body)
+    return web.Response(body=body, content_type="application/json")
+
 
 async def update_profile(request: web.Request) -> web.Response:
     """PUT /api/profile/{telegram_id} — обновить имя пользователя.
@@ -818,32 +1299,32 @@ async def update_profile(request: web.Request) -> web.Response:
     """
     telegram_id = _safe_int(request.match_info.get("telegram_id"), 0)
     if not telegram_id:
-        return web.json_response({"error": "Invalid telegram_id"}, status=400)
+        return _json_response({"error": "Invalid telegram_id"}, status=400)
 
     try:
-        body = await request.json()
+        body = await request.json(loads=orjson.loads)
     except Exception:
-        return web.json_response({"error": "Invalid JSON"}, status=400)
+        return _json_response({"error": "Invalid JSON"}, status=400)
 
     name = (body.get("name") or "").strip()
     if not name or len(name) > 100:
-        return web.json_response(
+        return _json_response(
             {"error": "Имя должно быть от 1 до 100 символов"},
             status=400,
         )
 
     pool = request.app["session_pool"]
     async with pool() as session:
-        user_stmt = select(User).where(User.telegram_id == telegram_id)
-        user = (await session.execute(user_stmt)).scalar_one_or_none()
+        user = (await session.execute(_USER_BY_TG, {"tg": telegram_id})).scalar_one_or_none()
 
         if not user:
-            return web.json_response({"error": "User not found"}, status=404)
+            return _json_response({"error": "User not found"}, status=404)
 
         user.full_name = name
         await session.commit()
+        invalidate_profile(telegram_id)
 
-        return web.json_response({"ok": True, "name": name})
+        return _json_response({"ok": True, "name": name})
 
 
 # ---------------------------------------------------------------------------
@@ -865,67 +1346,18 @@ async def get_user_ads(request: web.Request) -> web.Response:
     """
     telegram_id = _safe_int(request.match_info.get("telegram_id"), 0)
     if not telegram_id:
-        return web.json_response({"error": "Invalid telegram_id"}, status=400)
+        return _json_response({"error": "Invalid telegram_id"}, status=400)
 
-    pool = request.app["session_pool"]
+    # ── Все объявления пользователя + обложка (подзапрос) ─────
+    # Пользователь ищется подзапросом по telegram_id; car и plate —
+    # один UNION ALL. Нет пользователя — оба списка пустые.
+    pool = request.app["read_pool"]
     async with pool() as session:
-        # ── Найти пользователя по telegram_id ──────────────────────
-        user_stmt = select(User).where(User.telegram_id == telegram_id)
-        user = (await session.execute(user_stmt)).scalar_one_or_none()
-        if not user:
-            # Пользователь ещё не подавал объявлений — пустой ответ
-            return web.json_response({"cars": [], "plates": []})
+        rows = (await session.execute(_USER_ADS, {"tg": telegram_id})).all()
 
-        # ── Загрузить все car ads пользователя ─────────────────────
-        car_stmt = (
-            select(CarAd)
-            .where(CarAd.user_id == user.id)
-            .order_by(CarAd.created_at.desc())
-        )
-        car_ads = (await session.execute(car_stmt)).scalars().all()
+    cars_list, plates_list = _split_user_ads(rows)
 
-        # ── Загрузить все plate ads пользователя ───────────────────
-        plate_stmt = (
-            select(PlateAd)
-            .where(PlateAd.user_id == user.id)
-            .order_by(PlateAd.created_at.desc())
-        )
-        plate_ads = (await session.execute(plate_stmt)).scalars().all()
-
-        # ── Собрать первые фото для всех объявлений ────────────────
-        car_ids = [ad.id for ad in car_ads]
-        plate_ids = [ad.id for ad in plate_ads]
-        car_photos = await load_first_photos_map(session, AdType.CAR, car_ids)
-        plate_photos = await load_first_photos_map(session, AdType.PLATE, plate_ids)
-
-        # ── Формировать ответ ──────────────────────────────────────
-        cars_list = [
-            {
-                "id": ad.id,
-                "title": f"{ad.brand} {ad.model}",
-                "status": ad.status.value,
-                "price": ad.price,
-                "city": ad.city,
-                "photo": car_photos.get(ad.id),
-                "created_at": ad.created_at.isoformat() if ad.created_at else None,
-            }
-            for ad in car_ads
-        ]
-
-        plates_list = [
-            {
-                "id": ad.id,
-                "title": ad.plate_number,
-                "status": ad.status.value,
-                "price": ad.price,
-                "city": ad.city,
-                "photo": plate_photos.get(ad.id),
-                "created_at": ad.created_at.isoformat() if ad.created_at else None,
-            }
-            for ad in plate_ads
-        ]
-
-    return web.json_response({"cars": cars_list, "plates": plates_list})
+    return _json_response({"cars": cars_list, "plates": plates_list})
 
 
 # ---------------------------------------------------------------------------
@@ -958,6 +1390,34 @@ _PLATE_FIELD_CONVERTERS = {
     "price": lambda v, ad: _safe_int(v),
 }
 
+# Enum-поля: в снимке для валидатора нужны строковые значения
+_ENUM_FIELDS = frozenset({"fuel_type", "transmission"})
+
+
+def _make_field_snapshot(fields):
+    """Построить функцию ad → {field: value} для валидации правок.
+
+    attrgetter и список полей собираются один раз; enum-поля разворачиваются
+    в .value по заранее известному набору, без hasattr на каждое поле.
+    """
+    names = tuple(fields)
+    getter = attrgetter(*names)
+
+    def snapshot(ad) -> dict:
+        return {
+            name: (val.value if name in _ENUM_FIELDS and val is not None else val)
+            for name, val in zip(names, getter(ad))
+        }
+
+    return snapshot
+
+
+# Снимок текущих значений редактируемых полей по модели
+_FIELD_SNAPSHOTS = {
+    CarAd: _make_field_snapshot(_CAR_ALLOWED_FIELDS),
+    PlateAd: _make_field_snapshot(_PLATE_ALLOWED_FIELDS),
+}
+
 
 async def _edit_ad(
     request: web.Request,
@@ -979,61 +1439,56 @@ async def _edit_ad(
     """
     ad_id = _safe_int(request.match_info.get("ad_id"), 0)
     if not ad_id:
-        return web.json_response({"error": "Invalid ad_id"}, status=400)
+        return _json_response({"error": "Invalid ad_id"}, status=400)
 
     # user_id — from validated initData or legacy query param
     user_id_tg = get_authenticated_user_or_fallback(request)
     if not user_id_tg:
-        return web.json_response({"error": "Missing user_id"}, status=400)
+        return _json_response({"error": "Missing user_id"}, status=400)
 
     try:
-        body = await request.json()
+        body = await request.json(loads=orjson.loads)
     except Exception:
-        return web.json_response({"error": "Invalid JSON"}, status=400)
+        return _json_response({"error": "Invalid JSON"}, status=400)
+
+    # Только разрешённые поля
+    editable = {k: v for k, v in body.items() if k in allowed_fields}
 
     pool = request.app["session_pool"]
     async with pool() as session:
-        # ── Загрузить объявление ───────────────────────────────────
-        ad = (await session.execute(
-            select(model_class).where(model_class.id == ad_id)
-        )).scalar_one_or_none()
+        # ── Загрузить объявление + telegram_id владельца ───────────
+        ad, owner_tg = await _get_ad_with_owner(session, model_class, ad_id)
 
         if not ad:
-            return web.json_response({"error": "Ad not found"}, status=404)
+            return _json_response({"error": "Ad not found"}, status=404)
 
         # ── Проверка статуса (rejected нельзя редактировать) ───────
         if ad.status not in (AdStatus.PENDING, AdStatus.APPROVED):
-            return web.json_response(
+            return _json_response(
                 {"error": "Cannot edit rejected ad"}, status=400,
             )
 
         # ── Проверка владельца ─────────────────────────────────────
-        if not await check_ad_ownership(session, ad, user_id_tg):
-            return web.json_response({"error": "Forbidden"}, status=403)
+        if owner_tg != user_id_tg:
+            return _json_response({"error": "Forbidden"}, status=403)
+
+        # Редактировать нечего — изменений нет (после проверок доступа)
+        if not editable:
+            return _json_response({"ok": True})
 
         # ── Подготовить merged dict для валидации ──────────────────
         # Берём текущие значения объявления и мержим с присланными,
         # чтобы валидатор проверял полную картину.
-        current_data = {}
-        for field in allowed_fields:
-            val = getattr(ad, field, None)
-            # Enum → строковое значение для валидатора
-            if hasattr(val, "value"):
-                val = val.value
-            current_data[field] = val
-        merged = {**current_data, **body}
+        current_data = _FIELD_SNAPSHOTS[model_class](ad)
+        merged = {**current_data, **editable}
 
         # ── Валидация ──────────────────────────────────────────────
         errors = validator_fn(merged)
         if errors:
-            return web.json_response({"errors": errors}, status=400)
+            return _json_response({"errors": errors}, status=400)
 
         # ── Применить обновления ───────────────────────────────────
-        updated = False
-        for field, value in body.items():
-            if field not in allowed_fields:
-                continue
-
+        for field, value in editable.items():
             converter = field_converters.get(field)
             if converter:
                 value = converter(value, ad)
@@ -1041,15 +1496,16 @@ async def _edit_ad(
                 value = str(value).strip() if value is not None else None
 
             setattr(ad, field, value)
-            updated = True
 
         # ── Если было APPROVED — сбросить на PENDING для повторной модерации
-        if updated and ad.status == AdStatus.APPROVED:
+        if ad.status == AdStatus.APPROVED:
             ad.status = AdStatus.PENDING
 
         await session.commit()
+        _cities_cache.clear()
+        invalidate_profile(user_id_tg)
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 async def edit_car_ad_endpoint(request: web.Request) -> web.Response:
@@ -1077,32 +1533,32 @@ async def _delete_ad(request: web.Request, model_class) -> web.Response:
     """
     ad_id = _safe_int(request.match_info.get("ad_id"), 0)
     if not ad_id:
-        return web.json_response({"error": "Invalid ad_id"}, status=400)
+        return _json_response({"error": "Invalid ad_id"}, status=400)
 
     user_id_tg = get_authenticated_user_or_fallback(request)
     if not user_id_tg:
-        return web.json_response({"error": "Missing user_id"}, status=400)
+        return _json_response({"error": "Missing user_id"}, status=400)
 
     pool = request.app["session_pool"]
     async with pool() as session:
-        ad = (await session.execute(
-            select(model_class).where(model_class.id == ad_id)
-        )).scalar_one_or_none()
+        ad, owner_tg = await _get_ad_with_owner(session, model_class, ad_id)
 
         if not ad:
-            return web.json_response({"error": "Ad not found"}, status=404)
+            return _json_response({"error": "Ad not found"}, status=404)
 
         # ── Проверка владельца ─────────────────────────────────────
-        if not await check_ad_ownership(session, ad, user_id_tg):
-            return web.json_response({"error": "Forbidden"}, status=403)
+        if owner_tg != user_id_tg:
+            return _json_response({"error": "Forbidden"}, status=403)
 
         # ── Мягкое удаление ────────────────────────────────────────
         # TODO F19: Добавить возможность восстановления удалённых объявлений
         ad.status = AdStatus.REJECTED
         ad.rejection_reason = "Удалено владельцем"
         await session.commit()
+        _cities_cache.clear()
+        invalidate_profile(user_id_tg)
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 async def delete_car_ad_endpoint(request: web.Request) -> web.Response:
@@ -1118,6 +1574,55 @@ async def delete_plate_ad_endpoint(request: web.Request) -> web.Response:
 # --- Photo upload endpoint (Mini App) ---
 
 
+_UNSUPPORTED_PHOTO_ERROR = "Неподдерживаемый формат. Допустимы: JPEG, PNG, WebP"
+
+
+async def _save_photo_field(field) -> str:
+    """Сохранить фото из multipart-поля на диск. Вернуть photo_id.
+
+    Пишет порциями прямо во временный файл с проверкой размера — без
+    накопления тела в памяти; запись на диск выполняется в потоке.
+    Формат проверяется по сигнатуре первых байт (sniff_image_type) до
+    записи на диск; расширение файла — по сигнатуре, а не по Content-Type.
+    Готовый файл переносится на место rename'ом.
+
+    Исключения:
+        ValueError — файл пустой, слишком большой или неподдерживаемого типа
+    """
+    # Буфер файла под размер порции: короткие порции из сети
+    # склеиваются в одну запись, а не дробятся по 8 KB
+    tmp = open_upload_tempfile(UPLOAD_CHUNK_SIZE)
+    try:
+        size = 0
+        head = b""
+        image_type = None
+        while True:
+            chunk = await field.read_chunk(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > MAX_PHOTO_SIZE:
+                raise ValueError(f"Файл слишком большой (макс. {MAX_PHOTO_SIZE // 1024 // 1024}MB)")
+            if image_type is None:
+                head += chunk
+                if len(head) >= SNIFF_HEADER_SIZE:
+                    image_type = sniff_image_type(head)
+                    if image_type is None:
+                        raise ValueError(_UNSUPPORTED_PHOTO_ERROR)
+            await asyncio.to_thread(tmp.write, chunk)
+        await asyncio.to_thread(tmp.close)
+
+        if not size:
+            raise ValueError("Пустой файл")
+        if image_type is None:
+            raise ValueError(_UNSUPPORTED_PHOTO_ERROR)
+
+        return await asyncio.to_thread(save_photo_from_path, tmp.name, image_type)
+    finally:
+        tmp.close()
+        await asyncio.to_thread(discard_upload_tempfile, tmp.name)
+
+
 async def handle_photo_upload(request: web.Request) -> web.Response:
     """POST /api/photos/upload — загрузка одного фото через multipart.
 
@@ -1131,48 +1636,28 @@ async def handle_photo_upload(request: web.Request) -> web.Response:
     """
     user_id = _safe_int(request.query.get("user_id"), 0)
     if not user_id:
-        return web.json_response({"ok": False, "error": "Missing user_id"}, status=400)
+        return _json_response({"ok": False, "error": "Missing user_id"}, status=400)
 
     try:
         reader = await request.multipart()
         field = await reader.next()
 
         if field is None or field.name != "photo":
-            return web.json_response({"ok": False, "error": "Missing 'photo' field"}, status=400)
+            return _json_response({"ok": False, "error": "Missing 'photo' field"}, status=400)
 
         # Извлекаем Content-Type из заголовков multipart-поля
         content_type = field.headers.get("Content-Type", "").split(";")[0].strip()
         if content_type not in ALLOWED_TYPES:
-            return web.json_response(
-                {"ok": False, "error": "Неподдерживаемый формат. Допустимы: JPEG, PNG, WebP"},
-                status=400,
-            )
-
-        # Читаем файл порциями с проверкой размера
-        data = bytearray()
-        while True:
-            chunk = await field.read_chunk(8192)
-            if not chunk:
-                break
-            data.extend(chunk)
-            if len(data) > MAX_PHOTO_SIZE:
-                return web.json_response(
-                    {"ok": False, "error": f"Файл слишком большой (макс. {MAX_PHOTO_SIZE // 1024 // 1024}MB)"},
-                    status=400,
-                )
-
-        if not data:
-            return web.json_response({"ok": False, "error": "Пустой файл"}, status=400)
+            return _json_response({"ok": False, "error": _UNSUPPORTED_PHOTO_ERROR}, status=400)
 
-        # Сохраняем на диск и возвращаем идентификатор
-        photo_id = save_photo(bytes(data), content_type)
-        return web.json_response({"ok": True, "photo_id": photo_id})
+        photo_id = await _save_photo_field(field)
+        return _json_response({"ok": True, "photo_id": photo_id})
 
     except ValueError as e:
-        return web.json_response({"ok": False, "error": str(e)}, status=400)
+        return _json_response({"ok": False, "error": str(e)}, status=400)
     except Exception:
         logger.exception("[api/photos/upload] Error uploading photo")
-        return web.json_response({"ok": False, "error": "Ошибка загрузки"}, status=500)
+        return _json_response({"ok": False, "error": "Ошибка загрузки"}, status=500)
 
 
 # --- Submit endpoint (sendData fallback) ---
@@ -1186,59 +1671,43 @@ async def handle_submit(request: web.Request) -> web.Response:
     # Check Content-Type
     content_type = request.content_type or ""
     if "application/json" not in content_type:
-        return web.json_response(
+        return _json_response(
             {"ok": False, "error": "Content-Type must be application/json"},
             status=415,
         )
 
-    # Check body size (max 10 KB)
-    if request.content_length and request.content_length > MAX_SUBMIT_BODY_SIZE:
-        return web.json_response(
+    # Тело читается не больше MAX_SUBMIT_BODY_SIZE (10 KB) — лимит не
+    # зависит от заявленного (и подделываемого) Content-Length
+    raw_body = await _read_body_limited(request, MAX_SUBMIT_BODY_SIZE)
+    if raw_body is None:
+        return _json_response(
             {"ok": False, "error": "Request body too large"},
             status=413,
         )
 
     try:
-        raw_body = await request.read()
-        if len(raw_body) > MAX_SUBMIT_BODY_SIZE:
-            return web.json_response(
-                {"ok": False, "error": "Request body too large"},
-                status=413,
-            )
-        data = json.loads(raw_body)
-    except (json.JSONDecodeError, Exception):
-        return web.json_response({"ok": False, "error": "Invalid JSON"}, status=400)
+        data = orjson.loads(raw_body)
+    except orjson.JSONDecodeError:
+        return _json_response({"ok": False, "error": "Invalid JSON"}, status=400)
 
     ad_type = data.get("type")
     user_id_tg = data.get("user_id")
 
     if ad_type not in ("car_ad", "plate_ad"):
-        return web.json_response({"ok": False, "error": "Invalid ad type"}, status=400)
+        return _json_response({"ok": False, "error": "Invalid ad type"}, status=400)
     if not user_id_tg:
-        return web.json_response({"ok": False, "error": "Missing user_id"}, status=400)
+        return _json_response({"ok": False, "error": "Missing user_id"}, status=400)
 
     try:
         user_id_tg = int(user_id_tg)
     except (ValueError, TypeError):
-        return web.json_response({"ok": False, "error": "Invalid user_id"}, status=400)
+        return _json_response({"ok": False, "error": "Invalid user_id"}, status=400)
 
     # Rate limit check
     denied, reason = submit_limiter.check(f"user:{user_id_tg}")
     if denied:
         logger.warning("[api/submit] Rate limited user_id=%d: %s", user_id_tg, reason)
-        return web.json_response({"ok": False, "error": reason}, status=429)
-
-    # Check if user is banned
-    pool = request.app["session_pool"]
-    async with pool() as session:
-        user_check = (await session.execute(
-            select(User).where(User.telegram_id == user_id_tg)
-        )).scalar_one_or_none()
-        if user_check and user_check.is_banned:
-            return web.json_response(
-                {"ok": False, "error": "Ваш аккаунт заблокирован"},
-                status=403,
-            )
+        return _json_response({"ok": False, "error": reason}, status=429)
 
     # --- Validate fields ---
     if ad_type == "car_ad":
@@ -1247,21 +1716,42 @@ async def handle_submit(request: web.Request) -> web.Response:
         validation_errors = validate_plate_ad(data)
 
     if validation_errors:
-        return web.json_response(
+        # Бан важнее ошибок валидации. Для валидных данных бан проверяется
+        # по строке upsert'а ниже — здесь отдельный SELECT только на отказе.
+        async with request.app["read_pool"]() as session:
+            is_banned = (await session.execute(
+                _USER_BANNED_BY_TG, {"tg": user_id_tg},
+            )).scalar_one_or_none()
+        if is_banned:
+            return _json_response(
+                {"ok": False, "error": "Ваш аккаунт заблокирован"},
+                status=403,
+            )
+        return _json_response(
             {"ok": False, "errors": validation_errors}, status=400,
         )
 
     pool = request.app["session_pool"]
     bot = request.app.get("bot")
     storage = request.app.get("storage")
+    # Один момент времени на весь запрос: проверка дублей, срок, FSM
+    now = datetime.now(timezone.utc)
 
     try:
         # Извлекаем photo_ids из данных (если Mini App отправил фото заранее)
         photo_ids = data.get("photo_ids", [])
         has_photos = False  # флаг: есть ли валидные фото для авто-публикации
 
+        # Валидация: проверяем что каждый photo_id существует на диске.
+        # stat() блокирует — выполняем в потоке и до захвата соединения к БД.
+        valid_photos = []
+        if photo_ids and isinstance(photo_ids, list):
+            valid_photos = await asyncio.to_thread(
+                filter_existing_photos, photo_ids[:10],  # максимум 10 фото
+            )
+
         async with pool() as session:
-            # Get or create user
+            # Get or create user (upsert ... RETURNING — строка сразу с is_banned)
             user = await get_or_create_user(
                 session,
                 telegram_id=user_id_tg,
@@ -1269,32 +1759,40 @@ async def handle_submit(request: web.Request) -> web.Response:
                 full_name=data.get("full_name"),
             )
 
+            # Забаненным — отказ; upsert откатится при выходе из сессии
+            if user.is_banned:
+                return _json_response(
+                    {"ok": False, "error": "Ваш аккаунт заблокирован"},
+                    status=403,
+                )
+
             # ── Проверка дублей (та же марка+модель+год от того же пользователя за 7 дней) ──
-            week_ago = datetime.now(timezone.utc) - timedelta(days=DUPLICATE_CHECK_DAYS)
+            week_ago = now - timedelta(days=DUPLICATE_CHECK_DAYS)
 
+            # EXISTS — БД останавливается на первой найденной строке
             if ad_type == "car_ad":
                 dupe = (await session.execute(
-                    select(CarAd).where(
+                    select(exists().where(
                         CarAd.user_id == user.id,
                         CarAd.brand == str(data.get("brand", "")).strip(),
                         CarAd.model == str(data.get("model", "")).strip(),
                         CarAd.year == _safe_int(data.get("year")),
                         CarAd.created_at > week_ago,
                         CarAd.status != AdStatus.REJECTED,
-                    )
-                )).scalar_one_or_none()
+                    ))
+                )).scalar()
             else:
                 dupe = (await session.execute(
-                    select(PlateAd).where(
+                    select(exists().where(
                         PlateAd.user_id == user.id,
                         PlateAd.plate_number == str(data.get("plate_number", "")).strip(),
                         PlateAd.created_at > week_ago,
                         PlateAd.status != AdStatus.REJECTED,
-                    )
-                )).scalar_one_or_none()
+                    ))
+                )).scalar()
 
             if dupe and not data.get("force"):
-                return web.json_response({
+                return _json_response({
                     "ok": False,
                     "error": "Похожее объявление уже подано. Подождите или отредактируйте существующее.",
                     "error_type": "duplicate",
@@ -1342,63 +1840,37 @@ async def handle_submit(request: web.Request) -> web.Response:
                 )
 
             # ── Установить срок действия объявления (30 дней) ──
-            ad.expires_at = datetime.now(timezone.utc) + timedelta(days=AD_EXPIRY_DAYS)
+            ad.expires_at = now + timedelta(days=AD_EXPIRY_DAYS)
 
             # ── Обработка photo_ids (фото загруженные через /api/photos/upload) ──
             # Если Mini App отправил photo_ids — прикрепляем фото к объявлению
             # и автоматически одобряем + публикуем (без FSM-flow).
-            if photo_ids and isinstance(photo_ids, list):
-                # Валидация: проверяем что каждый photo_id существует на диске
-                valid_photos = []
-                for pid in photo_ids[:10]:  # максимум 10 фото
-                    if isinstance(pid, str) and is_local_photo(pid) and get_photo_path(pid):
-                        valid_photos.append(pid)
-
-                if valid_photos:
-                    # Прикрепить фото к объявлению в той же транзакции
-                    photo_ad_type_enum = AdType.CAR if ad_type == "car_ad" else AdType.PLATE
-                    for i, pid in enumerate(valid_photos):
-                        photo = AdPhoto(
-                            ad_type=photo_ad_type_enum,
-                            ad_id=ad.id,
-                            file_id=pid,
-                            position=i,
-                        )
-                        session.add(photo)
-
-                    # F13: НЕ авто-одобряем — объявление остаётся PENDING
-                    # Админ должен одобрить вручную через модерацию
-                    has_photos = True
+            if valid_photos:
+                # Прикрепить фото к объявлению в той же транзакции —
+                # одним multi-row INSERT вместо INSERT на каждое фото
+                photo_ad_type_enum = AdType.CAR if ad_type == "car_ad" else AdType.PLATE
+                await session.execute(insert(AdPhoto), [
+                    {
+                        "ad_type": photo_ad_type_enum,
+                        "ad_id": ad.id,
+                        "file_id": pid,
+                        "position": i,
+                    }
+                    for i, pid in enumerate(valid_photos)
+                ])
+
+                # F13: НЕ авто-одобряем — объявление остаётся PENDING
+                # Админ должен одобрить вручную через модерацию
+                has_photos = True
 
             await session.commit()
+        invalidate_profile(user_id_tg)
 
         # ── Пост-коммит логика: зависит от наличия фото ──────────────
-        if has_photos:
-            # F13: Фото есть, но НЕ публикуем — отправляем на модерацию
-            if bot:
-                await bot.send_message(
-                    user_id_tg,
-                    PHOTOS_SENT_TO_MODERATION,
-                )
-
-            return web.json_response({"ok": True, "ad_id": ad.id, "published": False})
-
-        # ── Фото нет — старый flow: просим прислать фото через Telegram ──
-        if bot:
-            if ad_type == "car_ad":
-                await bot.send_message(user_id_tg, WEB_APP_CAR_CREATED)
-            else:
-                await bot.send_message(user_id_tg, WEB_APP_PLATE_CREATED)
-
-            skip_kb = ReplyKeyboardMarkup(
-                keyboard=[[KeyboardButton(text=WEB_APP_SKIP_PHOTOS)]],
-                resize_keyboard=True,
-                one_time_keyboard=True,
-            )
-            await bot.send_message(user_id_tg, WEB_APP_SEND_PHOTOS, reply_markup=skip_kb)
-
-        # Set FSM state for photo collection (только если фото не были загружены)
-        if storage and bot:
+        # Set FSM state for photo collection (только если фото не были загружены).
+        # До отправки сообщений: просьба прислать фото не должна дойти
+        # раньше, чем выставлено состояние waiting_photos.
+        if not has_photos and storage and bot:
             bot_id = int(settings.bot_token.split(":")[0])
             key = StorageKey(
                 bot_id=bot_id,
@@ -1410,14 +1882,49 @@ async def handle_submit(request: web.Request) -> web.Response:
                 "ad_id": ad.id,
                 "ad_type": ad_type,
                 "photo_count": 0,
-                "started_at": datetime.now(timezone.utc).timestamp(),
+                "started_at": now.timestamp(),
             })
 
-        return web.json_response({"ok": True, "ad_id": ad.id})
+        # Сообщения в Telegram (100–300 мс каждое) уходят фоновой задачей —
+        # клиент получает ответ сразу после коммита.
+        if bot:
+            _spawn_background(
+                request.app, _notify_after_submit(bot, user_id_tg, ad_type, has_photos),
+            )
+
+        if has_photos:
+            # F13: Фото есть, но НЕ публикуем — отправляем на модерацию
+            return _json_response({"ok": True, "ad_id": ad.id, "published": False})
+
+        return _json_response({"ok": True, "ad_id": ad.id})
 
     except Exception:
         logger.exception("[api/submit] Error creating ad")
-        return web.json_response({"ok": False, "error": "Server error"}, status=500)
+        return _json_response({"ok": False, "error": "Server error"}, status=500)
+
+
+async def _notify_after_submit(bot, user_id_tg: int, ad_type: str, has_photos: bool) -> None:
+    """Отправить пользователю сообщения после подачи объявления (фоновая задача)."""
+    try:
+        if has_photos:
+            # F13: Фото есть, но НЕ публикуем — отправляем на модерацию
+            await bot.send_message(user_id_tg, PHOTOS_SENT_TO_MODERATION)
+            return
+
+        # ── Фото нет — старый flow: просим прислать фото через Telegram ──
+        if ad_type == "car_ad":
+            await bot.send_message(user_id_tg, WEB_APP_CAR_CREATED)
+        else:
+            await bot.send_message(user_id_tg, WEB_APP_PLATE_CREATED)
+
+        skip_kb = ReplyKeyboardMarkup(
+            keyboard=[[KeyboardButton(text=WEB_APP_SKIP_PHOTOS)]],
+            resize_keyboard=True,
+            one_time_keyboard=True,
+        )
+        await bot.send_message(user_id_tg, WEB_APP_SEND_PHOTOS, reply_markup=skip_kb)
+    except Exception:
+        logger.exception("[api/submit] Failed to notify user %d", user_id_tg)
 
 
 # ---------------------------------------------------------------------------
@@ -1432,35 +1939,40 @@ async def add_favorite(request: web.Request) -> web.Response:
     ad_id = _safe_int(request.query.get("ad_id"), 0)
 
     if not user_id_tg or not ad_id or ad_type not in ("car", "plate"):
-        return web.json_response({"ok": False, "error": "Missing params"}, status=400)
+        return _json_response({"ok": False, "error": "Missing params"}, status=400)
+
+    ad_type_enum = AdType.CAR if ad_type == "car" else AdType.PLATE
+
+    # INSERT ... SELECT id FROM users ... ON CONFLICT DO NOTHING — поиск
+    # пользователя, проверка дубля (uq_favorite) и вставка одним запросом
+    stmt = (
+        pg_insert(Favorite)
+        .from_select(
+            ["user_id", "ad_type", "ad_id"],
+            select(
+                User.id,
+                literal(ad_type_enum, Favorite.ad_type.type),
+                literal(ad_id, Favorite.ad_id.type),
+            ).where(User.telegram_id == user_id_tg),
+        )
+        .on_conflict_do_nothing(constraint="uq_favorite")
+        .returning(Favorite.id)
+    )
 
     pool = request.app["session_pool"]
     async with pool() as session:
-        user = (await session.execute(
-            select(User).where(User.telegram_id == user_id_tg)
-        )).scalar_one_or_none()
-        if not user:
-            return web.json_response({"ok": False, "error": "User not found"}, status=404)
-
-        ad_type_enum = AdType.CAR if ad_type == "car" else AdType.PLATE
-
-        # Проверить дубликат
-        existing = (await session.execute(
-            select(Favorite).where(
-                Favorite.user_id == user.id,
-                Favorite.ad_type == ad_type_enum,
-                Favorite.ad_id == ad_id,
-            )
-        )).scalar_one_or_none()
-
-        if existing:
-            return web.json_response({"ok": True, "message": "Already in favorites"})
-
-        fav = Favorite(user_id=user.id, ad_type=ad_type_enum, ad_id=ad_id)
-        session.add(fav)
+        inserted = (await session.execute(stmt)).scalar_one_or_none()
+        if inserted is None:
+            # Ничего не вставлено: либо уже в избранном, либо нет пользователя
+            user = (await session.execute(
+                _USER_BY_TG, {"tg": user_id_tg},
+            )).scalar_one_or_none()
+            if not user:
+                return _json_response({"ok": False, "error": "User not found"}, status=404)
+            return _json_response({"ok": True, "message": "Already in favorites"})
         await session.commit()
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 async def remove_favorite(request: web.Request) -> web.Response:
@@ -1470,15 +1982,15 @@ async def remove_favorite(request: web.Request) -> web.Response:
     ad_id = _safe_int(request.query.get("ad_id"), 0)
 
     if not user_id_tg or not ad_id or ad_type not in ("car", "plate"):
-        return web.json_response({"ok": False, "error": "Missing params"}, status=400)
+        return _json_response({"ok": False, "error": "Missing params"}, status=400)
 
     pool = request.app["session_pool"]
     async with pool() as session:
         user = (await session.execute(
-            select(User).where(User.telegram_id == user_id_tg)
+            _USER_BY_TG, {"tg": user_id_tg},
         )).scalar_one_or_none()
         if not user:
-            return web.json_response({"ok": False, "error": "User not found"}, status=404)
+            return _json_response({"ok": False, "error": "User not found"}, status=404)
 
         ad_type_enum = AdType.CAR if ad_type == "car" else AdType.PLATE
 
@@ -1494,22 +2006,22 @@ async def remove_favorite(request: web.Request) -> web.Response:
             await session.delete(fav)
             await session.commit()
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 async def get_favorites(request: web.Request) -> web.Response:
     """GET /api/favorites?user_id= — список избранного."""
     user_id_tg = get_authenticated_user_or_fallback(request) or 0
     if not user_id_tg:
-        return web.json_response({"ok": False, "error": "Missing user_id"}, status=400)
+        return _json_response({"ok": False, "error": "Missing user_id"}, status=400)
 
-    pool = request.app["session_pool"]
+    pool = request.app["read_pool"]
     async with pool() as session:
         user = (await session.execute(
-            select(User).where(User.telegram_id == user_id_tg)
+            _USER_BY_TG, {"tg": user_id_tg},
         )).scalar_one_or_none()
         if not user:
-            return web.json_response({"items": []})
+            return _json_response({"items": []})
 
         # Загрузить все favorites
         favs = (await session.execute(
@@ -1520,25 +2032,27 @@ async def get_favorites(request: web.Request) -> web.Response:
         car_fav_ids = [f.ad_id for f in favs if f.ad_type == AdType.CAR]
         plate_fav_ids = [f.ad_id for f in favs if f.ad_type == AdType.PLATE]
 
-        # Загрузить все объявления
+        # Загрузить все объявления вместе с обложкой (коррелированный подзапрос)
         car_ads_map: dict[int, CarAd] = {}
         plate_ads_map: dict[int, PlateAd] = {}
+        car_photos: dict[int, str | None] = {}
+        plate_photos: dict[int, str | None] = {}
 
         if car_fav_ids:
-            car_ads = (await session.execute(
-                select(CarAd).where(CarAd.id.in_(car_fav_ids), CarAd.status == AdStatus.APPROVED)
-            )).scalars().all()
-            car_ads_map = {ad.id: ad for ad in car_ads}
+            for ad, photo in (await session.execute(
+                select(CarAd, first_photo_subquery(AdType.CAR, CarAd.id))
+                .where(CarAd.id.in_(car_fav_ids), CarAd.status == AdStatus.APPROVED)
+            )).tuples():
+                car_ads_map[ad.id] = ad
+                car_photos[ad.id] = photo
 
         if plate_fav_ids:
-            plate_ads = (await session.execute(
-                select(PlateAd).where(PlateAd.id.in_(plate_fav_ids), PlateAd.status == AdStatus.APPROVED)
-            )).scalars().all()
-            plate_ads_map = {ad.id: ad for ad in plate_ads}
-
-        # Загрузить первые фото
-        car_photos = await load_first_photos_map(session, AdType.CAR, list(car_ads_map.keys()))
-        plate_photos = await load_first_photos_map(session, AdType.PLATE, list(plate_ads_map.keys()))
+            for ad, photo in (await session.execute(
+                select(PlateAd, first_photo_subquery(AdType.PLATE, PlateAd.id))
+                .where(PlateAd.id.in_(plate_fav_ids), PlateAd.status == AdStatus.APPROVED)
+            )).tuples():
+                plate_ads_map[ad.id] = ad
+                plate_photos[ad.id] = photo
 
         # Формируем ответ в порядке favorites (полные данные как в каталоге)
         items = []
@@ -1555,8 +2069,8 @@ async def get_favorites(request: web.Request) -> web.Response:
                         "price": ad.price,
                         "city": ad.city,
                         "mileage": ad.mileage,
-                        "fuel_type": ad.fuel_type.value,
-                        "transmission": ad.transmission.value,
+                        "fuel_type": _FUEL_VAL[ad.fuel_type],
+                        "transmission": _TRANS_VAL[ad.transmission],
                         "photo": car_photos.get(ad.id),
                         "view_count": ad.view_count or 0,
                     })
@@ -1589,7 +2103,7 @@ async def get_favorites(request: web.Request) -> web.Response:
                         "unavailable_reason": "Объявление снято с публикации",
                     })
 
-    return web.json_response({"items": items})
+    return _json_response({"items": items})
 
 
 # ---------------------------------------------------------------------------
@@ -1604,23 +2118,35 @@ async def mark_as_sold(request: web.Request) -> web.Response:
     user_id_tg = get_authenticated_user_or_fallback(request)
 
     if ad_type not in ("car", "plate") or not ad_id or not user_id_tg:
-        return web.json_response({"error": "Invalid params"}, status=400)
+        return _json_response({"error": "Invalid params"}, status=400)
 
     model = CarAd if ad_type == "car" else PlateAd
     pool = request.app["session_pool"]
 
     async with pool() as session:
-        ad = (await session.execute(select(model).where(model.id == ad_id))).scalar_one_or_none()
-        if not ad:
-            return web.json_response({"error": "Not found"}, status=404)
-
-        if not await check_ad_ownership(session, ad, user_id_tg):
-            return web.json_response({"error": "Forbidden"}, status=403)
+        # Проверка владельца — прямо в WHERE: один UPDATE ... RETURNING
+        sold_id = (await session.execute(
+            update(model)
+            .where(model.id == ad_id, model.user_id == _USER_ID_BY_TG)
+            .values(status=AdStatus.SOLD)
+            .returning(model.id)
+            .execution_options(synchronize_session=False),
+            {"tg": user_id_tg},
+        )).scalar_one_or_none()
+        if sold_id is None:
+            # Ничего не обновили: объявления нет или оно чужое
+            found = (await session.execute(
+                select(model.id).where(model.id == ad_id)
+            )).scalar_one_or_none()
+            if found is None:
+                return _json_response({"error": "Not found"}, status=404)
+            return _json_response({"error": "Forbidden"}, status=403)
 
-        ad.status = AdStatus.SOLD
         await session.commit()
+        _cities_cache.clear()
+        invalidate_profile(user_id_tg)
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 # --- Photo management endpoints ---
@@ -1632,9 +2158,9 @@ async def get_ad_photos(request: web.Request) -> web.Response:
     ad_id = _safe_int(request.match_info.get("ad_id"), 0)
 
     if ad_type not in ("car", "plate") or not ad_id:
-        return web.json_response({"error": "Invalid params"}, status=400)
+        return _json_response({"error": "Invalid params"}, status=400)
 
-    pool = request.app["session_pool"]
+    pool = request.app["read_pool"]
     async with pool() as session:
         photos = (await session.execute(
             select(AdPhoto)
@@ -1642,7 +2168,7 @@ async def get_ad_photos(request: web.Request) -> web.Response:
             .order_by(AdPhoto.position)
         )).scalars().all()
 
-        return web.json_response([
+        return _json_response([
             {"id": p.id, "file_id": p.file_id, "position": p.position}
             for p in photos
         ])
@@ -1655,22 +2181,22 @@ async def delete_ad_photo(request: web.Request) -> web.Response:
     photo_id = _safe_int(request.match_info.get("photo_id"), 0)
 
     if ad_type not in ("car", "plate") or not ad_id or not photo_id:
-        return web.json_response({"error": "Invalid params"}, status=400)
+        return _json_response({"error": "Invalid params"}, status=400)
 
     user_id_tg = get_authenticated_user_or_fallback(request)
     if not user_id_tg:
-        return web.json_response({"error": "Missing user_id"}, status=400)
+        return _json_response({"error": "Missing user_id"}, status=400)
 
     model = CarAd if ad_type == "car" else PlateAd
     pool = request.app["session_pool"]
 
     async with pool() as session:
-        ad = (await session.execute(select(model).where(model.id == ad_id))).scalar_one_or_none()
+        ad, owner_tg = await _get_ad_with_owner(session, model, ad_id)
         if not ad:
-            return web.json_response({"error": "Ad not found"}, status=404)
+            return _json_response({"error": "Ad not found"}, status=404)
 
-        if not await check_ad_ownership(session, ad, user_id_tg):
-            return web.json_response({"error": "Forbidden"}, status=403)
+        if owner_tg != user_id_tg:
+            return _json_response({"error": "Forbidden"}, status=403)
 
         photo = (await session.execute(
             select(AdPhoto).where(
@@ -1681,12 +2207,12 @@ async def delete_ad_photo(request: web.Request) -> web.Response:
         )).scalar_one_or_none()
 
         if not photo:
-            return web.json_response({"error": "Photo not found"}, status=404)
+            return _json_response({"error": "Photo not found"}, status=404)
 
         await session.delete(photo)
         await session.commit()
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 async def add_ad_photo(request: web.Request) -> web.Response:
@@ -1695,23 +2221,23 @@ async def add_ad_photo(request: web.Request) -> web.Response:
     ad_id = _safe_int(request.match_info.get("ad_id"), 0)
 
     if ad_type not in ("car", "plate") or not ad_id:
-        return web.json_response({"error": "Invalid params"}, status=400)
+        return _json_response({"error": "Invalid params"}, status=400)
 
     user_id_tg = get_authenticated_user_or_fallback(request)
     if not user_id_tg:
-        return web.json_response({"error": "Missing user_id"}, status=400)
+        return _json_response({"error": "Missing user_id"}, status=400)
 
     max_photos = MAX_CAR_PHOTOS if ad_type == "car" else MAX_PLATE_PHOTOS
     model = CarAd if ad_type == "car" else PlateAd
     pool = request.app["session_pool"]
 
     async with pool() as session:
-        ad = (await session.execute(select(model).where(model.id == ad_id))).scalar_one_or_none()
+        ad, owner_tg = await _get_ad_with_owner(session, model, ad_id)
         if not ad:
-            return web.json_response({"error": "Ad not found"}, status=404)
+            return _json_response({"error": "Ad not found"}, status=404)
 
-        if not await check_ad_ownership(session, ad, user_id_tg):
-            return web.json_response({"error": "Forbidden"}, status=403)
+        if owner_tg != user_id_tg:
+            return _json_response({"error": "Forbidden"}, status=403)
 
         # Проверить лимит фото
         current_count = (await session.execute(
@@ -1721,7 +2247,7 @@ async def add_ad_photo(request: web.Request) -> web.Response:
         )).scalar() or 0
 
         if current_count >= max_photos:
-            return web.json_response(
+            return _json_response(
                 {"error": f"Максимум {max_photos} фото"}, status=400,
             )
 
@@ -1730,33 +2256,19 @@ async def add_ad_photo(request: web.Request) -> web.Response:
             reader = await request.multipart()
             field = await reader.next()
         except Exception:
-            return web.json_response({"error": "Invalid multipart"}, status=400)
+            return _json_response({"error": "Invalid multipart"}, status=400)
 
         if field is None or field.name != "photo":
-            return web.json_response({"error": "Missing 'photo' field"}, status=400)
+            return _json_response({"error": "Missing 'photo' field"}, status=400)
 
         content_type = field.headers.get("Content-Type", "").split(";")[0].strip()
         if content_type not in ALLOWED_TYPES:
-            return web.json_response(
-                {"error": "Неподдерживаемый формат. Допустимы: JPEG, PNG, WebP"}, status=400,
-            )
-
-        data = bytearray()
-        while True:
-            chunk = await field.read_chunk(8192)
-            if not chunk:
-                break
-            data.extend(chunk)
-            if len(data) > MAX_PHOTO_SIZE:
-                return web.json_response(
-                    {"error": f"Файл слишком большой (макс. {MAX_PHOTO_SIZE // 1024 // 1024}MB)"},
-                    status=400,
-                )
+            return _json_response({"error": _UNSUPPORTED_PHOTO_ERROR}, status=400)
 
-        if not data:
-            return web.json_response({"error": "Пустой файл"}, status=400)
-
-        file_id = save_photo(bytes(data), content_type)
+        try:
+            file_id = await _save_photo_field(field)
+        except ValueError as e:
+            return _json_response({"error": str(e)}, status=400)
 
         # Определить следующую позицию
         max_pos = (await session.execute(
@@ -1775,7 +2287,7 @@ async def add_ad_photo(request: web.Request) -> web.Response:
         session.add(photo)
         await session.commit()
 
-        return web.json_response({
+        return _json_response({
             "ok": True,
             "photo": {"id": photo.id, "file_id": photo.file_id, "position": photo.position},
         })
@@ -1784,75 +2296,132 @@ async def add_ad_photo(request: web.Request) -> web.Response:
 # --- Admin endpoints ---
 
 
+def _encode_pending_cursor(created_at: datetime, kind: str, ad_id: int) -> str:
+    """Курсор очереди модерации: base64url("created_at|kind|id")."""
+    raw = f"{created_at.isoformat()}|{kind}|{ad_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_pending_cursor(cursor: str) -> tuple[datetime, int, int] | None:
+    """Разобрать курсор в (created_at, ранг типа, id). None — битый курсор."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, kind, ad_id = raw.split("|")
+        return datetime.fromisoformat(created_at), _PENDING_KIND_RANK[kind], int(ad_id)
+    except (binascii.Error, UnicodeError, ValueError, KeyError):
+        return None
+
+
+def _pending_after(model_class, rank: int, after: tuple[datetime, int, int]):
+    """WHERE для keyset: строки таблицы с рангом rank строго после курсора."""
+    ts, after_rank, after_id = after
+    if rank < after_rank:
+        return model_class.created_at > ts
+    if rank > after_rank:
+        return model_class.created_at >= ts
+    return tuple_(model_class.created_at, model_class.id) > tuple_(ts, after_id)
+
+
 async def admin_get_pending(request: web.Request) -> web.Response:
-    """GET /api/admin/pending — list all pending ads for moderation."""
+    """GET /api/admin/pending — pending ads for moderation, oldest first.
+
+    Query params:
+        limit  — размер страницы (default 50, max 200)
+        cursor — next_cursor из предыдущего ответа (keyset-пагинация)
+
+    Без limit и cursor отдаётся вся очередь одним списком (так её
+    запрашивает Mini App). total — размер всей очереди.
+
+    Response: {items: [...], total: int, next_cursor: str | null}
+    """
     if not _check_admin_access(request):
         raise web.HTTPForbidden(text="Access denied")
 
-    pool = request.app["session_pool"]
-    async with pool() as session:
-        # Pending car ads
-        car_stmt = (
-            select(CarAd)
-            .where(CarAd.status == AdStatus.PENDING)
-            .order_by(CarAd.created_at)
+    cursor = request.query.get("cursor")
+    paged = bool(cursor) or "limit" in request.query
+    limit = min(
+        _safe_int(request.query.get("limit"), ADMIN_PENDING_PAGE_SIZE) or ADMIN_PENDING_PAGE_SIZE,
+        ADMIN_PENDING_MAX_PAGE_SIZE,
+    )
+    car_stmt, plate_stmt = _PENDING_CAR_ADS, _PENDING_PLATE_ADS
+    if cursor:
+        after = _decode_pending_cursor(cursor)
+        if after is None:
+            return _json_response({"error": "Invalid cursor"}, status=400)
+        car_stmt = car_stmt.where(_pending_after(CarAd, _PENDING_KIND_RANK["car"], after))
+        plate_stmt = plate_stmt.where(_pending_after(PlateAd, _PENDING_KIND_RANK["plate"], after))
+
+    pool = request.app["read_pool"]
+    # Car и plate независимы — каждый в своей сессии, параллельно.
+    # Только нужные колонки + обложка (коррелированный LIMIT 1 подзапрос).
+    # limit + 1 строк с каждой таблицы хватает, чтобы собрать страницу
+    # общей очереди и понять, есть ли следующая; total страницы — отдельным
+    # COUNT по всей очереди.
+    if paged:
+        car_rows, plate_rows, count_rows = await asyncio.gather(
+            _fetch_rows(pool, car_stmt.limit(limit + 1)),
+            _fetch_rows(pool, plate_stmt.limit(limit + 1)),
+            _fetch_rows(pool, _PENDING_COUNT),
         )
-        car_ads = (await session.execute(car_stmt)).scalars().all()
-
-        # Pending plate ads
-        plate_stmt = (
-            select(PlateAd)
-            .where(PlateAd.status == AdStatus.PENDING)
-            .order_by(PlateAd.created_at)
+        total = count_rows[0][0]
+    else:
+        car_rows, plate_rows = await asyncio.gather(
+            _fetch_rows(pool, car_stmt),
+            _fetch_rows(pool, plate_stmt),
         )
-        plate_ads = (await session.execute(plate_stmt)).scalars().all()
-
-        # Get first photos for all ads
-        car_ids = [ad.id for ad in car_ads]
-        plate_ids = [ad.id for ad in plate_ads]
-        photos_map: dict[str, dict[int, str]] = {
-            "car": await load_first_photos_map(session, AdType.CAR, car_ids),
-            "plate": await load_first_photos_map(session, AdType.PLATE, plate_ids),
+        total = len(car_rows) + len(plate_rows)
+
+    items = [
+        {
+            "ad_type": "car",
+            "id": row.id,
+            "title": f"{row.brand} {row.model} ({row.year})",
+            "brand": row.brand,
+            "model": row.model,
+            "year": row.year,
+            "price": row.price,
+            "city": row.city,
+            "mileage": row.mileage,
+            "engine_volume": row.engine_volume,
+            "fuel_type": _FUEL_VAL[row.fuel_type],
+            "transmission": _TRANS_VAL[row.transmission],
+            "color": row.color,
+            "description": row.description,
+            "contact_phone": row.contact_phone,
+            "contact_telegram": row.contact_telegram,
+            "photo": row.photo,
+            "created_at": row.created_at,
+        }
+        for row in car_rows
+    ]
+    items.extend(
+        {
+            "ad_type": "plate",
+            "id": row.id,
+            "title": row.plate_number,
+            "plate_number": row.plate_number,
+            "price": row.price,
+            "city": row.city,
+            "description": row.description,
+            "contact_phone": row.contact_phone,
+            "contact_telegram": row.contact_telegram,
+            "photo": row.photo,
+            "created_at": row.created_at,
         }
+        for row in plate_rows
+    )
 
-        items = []
-        for ad in car_ads:
-            items.append({
-                "ad_type": "car",
-                "id": ad.id,
-                "title": f"{ad.brand} {ad.model} ({ad.year})",
-                "brand": ad.brand,
-                "model": ad.model,
-                "year": ad.year,
-                "price": ad.price,
-                "city": ad.city,
-                "mileage": ad.mileage,
-                "engine_volume": ad.engine_volume,
-                "fuel_type": ad.fuel_type.value,
-                "transmission": ad.transmission.value,
-                "color": ad.color,
-                "description": ad.description,
-                "contact_phone": ad.contact_phone,
-                "contact_telegram": ad.contact_telegram,
-                "photo": photos_map["car"].get(ad.id),
-                "created_at": ad.created_at.isoformat() if ad.created_at else None,
-            })
-        for ad in plate_ads:
-            items.append({
-                "ad_type": "plate",
-                "id": ad.id,
-                "title": ad.plate_number,
-                "plate_number": ad.plate_number,
-                "price": ad.price,
-                "city": ad.city,
-                "description": ad.description,
-                "contact_phone": ad.contact_phone,
-                "contact_telegram": ad.contact_telegram,
-                "photo": photos_map["plate"].get(ad.id),
-                "created_at": ad.created_at.isoformat() if ad.created_at else None,
-            })
+    # Слить две упорядоченные выборки в общий порядок очереди
+    items.sort(key=lambda item: (
+        item["created_at"], _PENDING_KIND_RANK[item["ad_type"]], item["id"],
+    ))
+    next_cursor = None
+    if paged and len(items) > limit:
+        del items[limit:]
+        last = items[-1]
+        next_cursor = _encode_pending_cursor(last["created_at"], last["ad_type"], last["id"])
 
-    return web.json_response({"items": items, "total": len(items)})
+    return _json_response({"items": items, "total": total, "next_cursor": next_cursor})
 
 
 async def admin_get_stats(request: web.Request) -> web.Response:
@@ -1860,29 +2429,22 @@ async def admin_get_stats(request: web.Request) -> web.Response:
     if not _check_admin_access(request):
         raise web.HTTPForbidden(text="Access denied")
 
-    pool = request.app["session_pool"]
-    async with pool() as session:
-        stats = {}
-        for label, status in [
-            ("pending", AdStatus.PENDING),
-            ("approved", AdStatus.APPROVED),
-            ("rejected", AdStatus.REJECTED),
-        ]:
-            car_count = (
-                await session.execute(
-                    select(func.count()).select_from(CarAd).where(CarAd.status == status)
-                )
-            ).scalar_one()
-            plate_count = (
-                await session.execute(
-                    select(func.count()).select_from(PlateAd).where(PlateAd.status == status)
-                )
-            ).scalar_one()
-            stats[label] = car_count + plate_count
+    # Один GROUP BY status на таблицу вместо COUNT на каждый статус;
+    # обе таблицы — параллельно, каждая в своей сессии
+    pool = request.app["read_pool"]
+    car_rows, plate_rows = await asyncio.gather(
+        _fetch_rows(pool, _CAR_STATUS_COUNTS),
+        _fetch_rows(pool, _PLATE_STATUS_COUNTS),
+    )
 
-        stats["total"] = stats["pending"] + stats["approved"] + stats["rejected"]
+    stats = dict.fromkeys(_ADMIN_STATS_LABELS.values(), 0)
+    for status, count in (*car_rows, *plate_rows):
+        label = _ADMIN_STATS_LABELS.get(status)
+        if label is not None:
+            stats[label] += count
+    stats["total"] = stats["pending"] + stats["approved"] + stats["rejected"]
 
-    return web.json_response(stats)
+    return _json_response(stats)
 
 
 async def admin_approve(request: web.Request) -> web.Response:
@@ -1901,10 +2463,8 @@ async def admin_approve(request: web.Request) -> web.Response:
     pool = request.app["session_pool"]
     async with pool() as session:
         if ad_type == "car":
-            from app.services.car_ad_service import approve_car_ad
             ad = await approve_car_ad(session, ad_id)
         else:
-            from app.services.plate_ad_service import approve_plate_ad
             ad = await approve_plate_ad(session, ad_id)
 
         if not ad:
@@ -1912,25 +2472,43 @@ async def admin_approve(request: web.Request) -> web.Response:
 
         # Commit first so approve persists even if publish/notify fails
         await session.commit()
+        _cities_cache.clear()
 
-        # Notify user
-        try:
-            from app.models.user import User
-            user_stmt = select(User).where(User.id == ad.user_id)
-            user = (await session.execute(user_stmt)).scalar_one_or_none()
-            bot = request.app.get("bot")
-            if user and bot:
-                from app.texts import USER_AD_APPROVED
-                await bot.send_message(user.telegram_id, USER_AD_APPROVED)
-        except Exception:
-            logger.exception("Failed to notify user about approval")
+        owner_tg = ad.user.telegram_id
+        invalidate_profile(owner_tg)
 
-        # Publish to channel
-        bot = request.app.get("bot")
-        if bot:
-            await publish_to_channel(bot, ad, ad_type, session)
+    # Уведомление и публикация в канал — фоном, модератор не ждёт Telegram
+    bot = request.app.get("bot")
+    if bot:
+        _spawn_background(
+            request.app,
+            _notify_and_publish_approved(request.app, bot, ad_type, ad.id, owner_tg),
+        )
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
+
+
+async def _notify_and_publish_approved(
+    app: web.Application, bot, ad_type: str, ad_id: int, owner_tg: int,
+) -> None:
+    """Уведомить автора об одобрении и опубликовать объявление (фоновая задача).
+
+    Работает в своей сессии: сессия обработчика к этому моменту закрыта,
+    а publish_to_channel сохраняет channel_message_id и коммитит.
+    """
+    try:
+        await bot.send_message(owner_tg, USER_AD_APPROVED)
+    except Exception:
+        logger.exception("Failed to notify user about approval")
+
+    model_class = CarAd if ad_type == "car" else PlateAd
+    try:
+        async with app["session_pool"]() as session:
+            ad = await session.get(model_class, ad_id)
+            if ad:
+                await publish_to_channel(bot, ad, ad_type, session)
+    except Exception:
+        logger.exception("Failed to publish ad %s/%s to channel", ad_type, ad_id)
 
 
 async def admin_reject(request: web.Request) -> web.Response:
@@ -1949,7 +2527,7 @@ async def admin_reject(request: web.Request) -> web.Response:
     # Parse optional reason from request body
     reason = "Не прошло модерацию"
     try:
-        body = await request.json()
+        body = await request.json(loads=orjson.loads)
         if body.get("reason"):
             reason = body["reason"]
     except Exception:
@@ -1958,10 +2536,8 @@ async def admin_reject(request: web.Request) -> web.Response:
     pool = request.app["session_pool"]
     async with pool() as session:
         if ad_type == "car":
-            from app.services.car_ad_service import reject_car_ad
             ad = await reject_car_ad(session, ad_id, reason=reason)
         else:
-            from app.services.plate_ad_service import reject_plate_ad
             ad = await reject_plate_ad(session, ad_id, reason=reason)
 
         if not ad:
@@ -1970,19 +2546,18 @@ async def admin_reject(request: web.Request) -> web.Response:
         # Commit first so rejection persists even if notify fails
         await session.commit()
 
+        owner_tg = ad.user.telegram_id
+        invalidate_profile(owner_tg)
+
         # Notify user
         try:
-            from app.models.user import User
-            user_stmt = select(User).where(User.id == ad.user_id)
-            user = (await session.execute(user_stmt)).scalar_one_or_none()
             bot = request.app.get("bot")
-            if user and bot:
-                from app.texts import USER_AD_REJECTED
-                await bot.send_message(user.telegram_id, USER_AD_REJECTED)
+            if bot:
+                await bot.send_message(owner_tg, USER_AD_REJECTED)
         except Exception:
             logger.exception("Failed to notify user about rejection")
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 # ---------------------------------------------------------------------------
@@ -2007,7 +2582,7 @@ async def admin_get_users(request: web.Request) -> web.Response:
     offset = _safe_int(request.query.get("offset"), 0)
     limit = min(_safe_int(request.query.get("limit"), DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
 
-    pool = request.app["session_pool"]
+    pool = request.app["read_pool"]
     async with pool() as session:
         stmt = select(User)
         count_stmt = select(func.count()).select_from(User)
@@ -2059,13 +2634,13 @@ async def admin_get_users(request: web.Request) -> web.Response:
                 "phone": user.phone,
                 "is_banned": user.is_banned,
                 "is_admin": user.is_admin,
-                "created_at": user.created_at.isoformat() if user.created_at else None,
+                "created_at": user.created_at,
                 "ads_count": ads_count_map.get(user.id, 0),
             }
             for user in users
         ]
 
-    return web.json_response({"items": items, "total": total})
+    return _json_response({"items": items, "total": total})
 
 
 async def admin_get_user_detail(request: web.Request) -> web.Response:
@@ -2078,72 +2653,35 @@ async def admin_get_user_detail(request: web.Request) -> web.Response:
 
     telegram_id = _safe_int(request.match_info.get("telegram_id"), 0)
     if not telegram_id:
-        return web.json_response({"error": "Invalid telegram_id"}, status=400)
-
-    pool = request.app["session_pool"]
-    async with pool() as session:
-        user = (await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )).scalar_one_or_none()
-
-        if not user:
-            raise web.HTTPNotFound(text="User not found")
-
-        # Загрузить все car ads пользователя
-        car_ads = (await session.execute(
-            select(CarAd).where(CarAd.user_id == user.id).order_by(CarAd.created_at.desc())
-        )).scalars().all()
-
-        # Загрузить все plate ads пользователя
-        plate_ads = (await session.execute(
-            select(PlateAd).where(PlateAd.user_id == user.id).order_by(PlateAd.created_at.desc())
-        )).scalars().all()
-
-        # Собрать первые фото
-        car_ids = [ad.id for ad in car_ads]
-        plate_ids = [ad.id for ad in plate_ads]
-        car_photos = await load_first_photos_map(session, AdType.CAR, car_ids)
-        plate_photos = await load_first_photos_map(session, AdType.PLATE, plate_ids)
-
-        # Формируем ответ
-        user_data = {
-            "id": user.id,
-            "telegram_id": user.telegram_id,
-            "username": user.username,
-            "full_name": user.full_name,
-            "phone": user.phone,
-            "is_banned": user.is_banned,
-            "is_admin": user.is_admin,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-        }
-
-        cars_list = [
-            {
-                "id": ad.id,
-                "title": f"{ad.brand} {ad.model}",
-                "status": ad.status.value,
-                "price": ad.price,
-                "city": ad.city,
-                "photo": car_photos.get(ad.id),
-                "created_at": ad.created_at.isoformat() if ad.created_at else None,
-            }
-            for ad in car_ads
-        ]
-
-        plates_list = [
-            {
-                "id": ad.id,
-                "title": ad.plate_number,
-                "status": ad.status.value,
-                "price": ad.price,
-                "city": ad.city,
-                "photo": plate_photos.get(ad.id),
-                "created_at": ad.created_at.isoformat() if ad.created_at else None,
-            }
-            for ad in plate_ads
-        ]
-
-    return web.json_response({
+        return _json_response({"error": "Invalid telegram_id"}, status=400)
+
+    pool = request.app["read_pool"]
+    # Пользователь и его объявления (UNION ALL, с обложками) — два
+    # независимых запроса по telegram_id, каждый в своей сессии, параллельно
+    params = {"tg": telegram_id}
+    user_rows, ad_rows = await asyncio.gather(
+        _fetch_rows(pool, _USER_BY_TG, params),
+        _fetch_rows(pool, _USER_ADS, params),
+    )
+    if not user_rows:
+        raise web.HTTPNotFound(text="User not found")
+    user = user_rows[0][0]
+
+    # Формируем ответ
+    user_data = {
+        "id": user.id,
+        "telegram_id": user.telegram_id,
+        "username": user.username,
+        "full_name": user.full_name,
+        "phone": user.phone,
+        "is_banned": user.is_banned,
+        "is_admin": user.is_admin,
+        "created_at": user.created_at,
+    }
+
+    cars_list, plates_list = _split_user_ads(ad_rows)
+
+    return _json_response({
         "user": user_data,
         "cars": cars_list,
         "plates": plates_list,
@@ -2157,21 +2695,20 @@ async def admin_ban_user(request: web.Request) -> web.Response:
 
     telegram_id = _safe_int(request.match_info.get("telegram_id"), 0)
     if not telegram_id:
-        return web.json_response({"error": "Invalid telegram_id"}, status=400)
+        return _json_response({"error": "Invalid telegram_id"}, status=400)
 
     pool = request.app["session_pool"]
     async with pool() as session:
-        user = (await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
+        updated = (await session.execute(
+            _SET_USER_BANNED, {"tg": telegram_id, "banned": True},
         )).scalar_one_or_none()
 
-        if not user:
+        if updated is None:
             raise web.HTTPNotFound(text="User not found")
 
-        user.is_banned = True
         await session.commit()
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 async def admin_unban_user(request: web.Request) -> web.Response:
@@ -2181,21 +2718,20 @@ async def admin_unban_user(request: web.Request) -> web.Response:
 
     telegram_id = _safe_int(request.match_info.get("telegram_id"), 0)
     if not telegram_id:
-        return web.json_response({"error": "Invalid telegram_id"}, status=400)
+        return _json_response({"error": "Invalid telegram_id"}, status=400)
 
     pool = request.app["session_pool"]
     async with pool() as session:
-        user = (await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
+        updated = (await session.execute(
+            _SET_USER_BANNED, {"tg": telegram_id, "banned": False},
         )).scalar_one_or_none()
 
-        if not user:
+        if updated is None:
             raise web.HTTPNotFound(text="User not found")
 
-        user.is_banned = False
         await session.commit()
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 # ---------------------------------------------------------------------------
@@ -2226,12 +2762,12 @@ async def _admin_edit_ad(
 
     ad_id = _safe_int(request.match_info.get("ad_id"), 0)
     if not ad_id:
-        return web.json_response({"error": "Invalid ad_id"}, status=400)
+        return _json_response({"error": "Invalid ad_id"}, status=400)
 
     try:
-        body = await request.json()
+        body = await request.json(loads=orjson.loads)
     except Exception:
-        return web.json_response({"error": "Invalid JSON"}, status=400)
+        return _json_response({"error": "Invalid JSON"}, status=400)
 
     # Определяем admin user_id для логирования
     admin_user_id = (
@@ -2248,22 +2784,16 @@ async def _admin_edit_ad(
         )).scalar_one_or_none()
 
         if not ad:
-            return web.json_response({"error": "Ad not found"}, status=404)
+            return _json_response({"error": "Ad not found"}, status=404)
 
         # ── Подготовить merged dict для валидации ──────────────────
-        current_data = {}
-        for field in allowed_fields:
-            val = getattr(ad, field, None)
-            # Enum → строковое значение для валидатора
-            if hasattr(val, "value"):
-                val = val.value
-            current_data[field] = val
+        current_data = _FIELD_SNAPSHOTS[model_class](ad)
         merged = {**current_data, **body}
 
         # ── Валидация ──────────────────────────────────────────────
         errors = validator_fn(merged)
         if errors:
-            return web.json_response({"errors": errors}, status=400)
+            return _json_response({"errors": errors}, status=400)
 
         # ── Применить обновления ───────────────────────────────────
         updated_fields = []
@@ -2283,6 +2813,7 @@ async def _admin_edit_ad(
         # НЕ меняем статус — админ редактирует уже одобренное (или любое)
 
         await session.commit()
+        _cities_cache.clear()
 
         # Логируем редактирование
         logger.info(
@@ -2290,7 +2821,7 @@ async def _admin_edit_ad(
             ad_type_label, admin_user_id, ad_id, updated_fields,
         )
 
-    return web.json_response({"ok": True})
+    return _json_response({"ok": True})
 
 
 async def admin_edit_car_ad(request: web.Request) -> web.Response:
@@ -2347,6 +2878,97 @@ _RANDOM_DESCRIPTIONS = [
     "Экономичный расход, идеальна для города. Обмен не предлагать.",
 ]
 
+# Те же справочники для генерации на стороне Postgres (?count=N): массивы,
+# из которых SELECT берёт элемент по случайному индексу (PG-массивы с 1)
+_RANDOM_BRAND_MODELS = [
+    (brand, model) for brand, models in BRANDS.items() for model in (models or ["Базовая"])
+]
+_GEN_BRANDS = array([b for b, _ in _RANDOM_BRAND_MODELS])
+_GEN_MODELS = array([m for _, m in _RANDOM_BRAND_MODELS])
+_GEN_COLORS = array(_RANDOM_COLORS)
+_GEN_CITIES = array([c for c, _ in _RANDOM_CITY_REGIONS])
+_GEN_REGIONS = array([r for _, r in _RANDOM_CITY_REGIONS])
+_GEN_DESCRIPTIONS = array(_RANDOM_DESCRIPTIONS)
+# Enum хранится по имени — выбираем имя и приводим к типу колонки
+_GEN_TRANSMISSIONS = array([t.name for t in Transmission])
+
+
+def _random_int(low: int, high: int):
+    """SQL-выражение: случайное целое в [low, high] (своё на каждую строку)."""
+    return cast(func.floor(func.random() * (high - low + 1)), Integer) + low
+
+
+async def _generate_car_ads_bulk(session, user_id: int, count: int) -> int:
+    """Сгенерировать count одобренных car-объявлений одним INSERT ... SELECT.
+
+    Случайные значения считает Postgres по generate_series — без ORM и
+    Python-цикла на строку. Распределения те же, что у одиночной генерации
+    (бренд/модель — равновероятно по парам). Фото не прикрепляются.
+
+    Returns: число созданных объявлений.
+    """
+    # Индексы выбираются во внутреннем SELECT, чтобы бренд и модель
+    # брались по одному и тому же индексу (volatile random() не сворачивается)
+    picks = select(
+        _random_int(1, len(_RANDOM_BRAND_MODELS)).label("bm"),
+        _random_int(1, len(_RANDOM_CITY_REGIONS)).label("cr"),
+    ).select_from(func.generate_series(1, count)).subquery()
+
+    phone = (
+        "8"
+        + cast(_random_int(900, 999), String)
+        + cast(_random_int(1000000, 9999999), String)
+    )
+    values = select(
+        literal(user_id),
+        _GEN_BRANDS[picks.c.bm],
+        _GEN_MODELS[picks.c.bm],
+        _random_int(2005, 2025),
+        _random_int(0, 300000),
+        literal(0.0, Float),
+        cast(literal(FuelType.PETROL.name), CarAd.fuel_type.type),
+        cast(_GEN_TRANSMISSIONS[_random_int(1, len(Transmission))], CarAd.transmission.type),
+        _GEN_COLORS[_random_int(1, len(_RANDOM_COLORS))],
+        _random_int(200, 5000) * 1000,
+        _GEN_DESCRIPTIONS[_random_int(1, len(_RANDOM_DESCRIPTIONS))],
+        func.random() < 0.25,  # ~25% с ГБО
+        _GEN_REGIONS[picks.c.cr],
+        _GEN_CITIES[picks.c.cr],
+        phone,
+        cast(literal(AdStatus.APPROVED.name), CarAd.status.type),
+        literal(datetime.now(timezone.utc) + timedelta(days=AD_EXPIRY_DAYS)),
+    ).select_from(picks)
+
+    stmt = insert(CarAd).from_select(
+        [
+            "user_id", "brand", "model", "year", "mileage", "engine_volume",
+            "fuel_type", "transmission", "color", "price", "description",
+            "has_gbo", "region", "city", "contact_phone", "status", "expires_at",
+        ],
+        values,
+    )
+    result = await session.execute(stmt)
+    return result.rowcount
+
+
+async def _get_generate_admin_user(session, admin_tg_id: int) -> User:
+    """Админ — автор сгенерированных объявлений.
+
+    Ищется БЕЗ перезаписи его данных (get_or_create обновляет username/name);
+    если админа ещё нет в базе — создаётся.
+    """
+    user = (await session.execute(
+        _USER_BY_TG, {"tg": admin_tg_id},
+    )).scalar_one_or_none()
+    if user:
+        return user
+    return await get_or_create_user(
+        session,
+        telegram_id=admin_tg_id,
+        username="admin",
+        full_name="Администратор",
+    )
+
 
 async def admin_generate_ad(request: web.Request) -> web.Response:
     """POST /api/admin/generate — сгенерировать тестовое объявление.
@@ -2358,15 +2980,32 @@ async def admin_generate_ad(request: web.Request) -> web.Response:
     Поля НЕ в форме (engine_volume, fuel_type) оставляем дефолтными (0 / бензин).
     Прикрепляет до 3 случайных фото из уже существующих в БД.
     Объявление создаётся со статусом APPROVED (сразу в каталоге).
+
+    ?count=N (N > 1, до ADMIN_GENERATE_MAX_COUNT) — массовое наполнение:
+    N объявлений одним INSERT ... SELECT на стороне Postgres, без фото.
     """
     if not _check_admin_access(request):
         raise web.HTTPForbidden(text="Access denied")
 
+    # Всё, что не требует БД, — до того как занять соединение пула
+    admin_tg_id = settings.admin_ids[0] if settings.admin_ids else 0
+    if not admin_tg_id:
+        return _json_response({"ok": False, "error": "No admin configured"}, status=500)
+
+    count = min(_safe_int(request.query.get("count"), 1), ADMIN_GENERATE_MAX_COUNT)
+
     pool = request.app["session_pool"]
 
+    if count > 1:
+        async with pool() as session:
+            user = await _get_generate_admin_user(session, admin_tg_id)
+            created = await _generate_car_ads_bulk(session, user.id, count)
+            await session.commit()
+        _cities_cache.clear()
+        return _json_response({"ok": True, "count": created})
+
     # ── Рандомные данные — ТОЛЬКО поля из формы CreateCarAd ──
-    brand_names = list(BRANDS.keys())
-    brand = random.choice(brand_names)
+    brand = random.choice(_BRAND_NAMES)
     models = BRANDS[brand]
     model = random.choice(models) if models else "Базовая"
 
@@ -2381,23 +3020,7 @@ async def admin_generate_ad(request: web.Request) -> web.Response:
     phone = f"8{random.randint(900,999)}{random.randint(1000000,9999999)}"
 
     async with pool() as session:
-        admin_tg_id = settings.admin_ids[0] if settings.admin_ids else 0
-        if not admin_tg_id:
-            return web.json_response({"ok": False, "error": "No admin configured"}, status=500)
-
-        # Найти админа БЕЗ перезаписи его данных (get_or_create обновляет username/name)
-        user = (await session.execute(
-            select(User).where(User.telegram_id == admin_tg_id)
-        )).scalar_one_or_none()
-        
-        if not user:
-            # Админ ещё не в базе — создаём
-            user = await get_or_create_user(
-                session,
-                telegram_id=admin_tg_id,
-                username="admin",
-                full_name="Администратор",
-            )
+        user = await _get_generate_admin_user(session, admin_tg_id)
 
         # Создать объявление — engine_volume=0 и fuel_type=PETROL (дефолты,
         # эти поля не в форме и не показываются в карточке)
@@ -2425,37 +3048,33 @@ async def admin_generate_ad(request: web.Request) -> web.Response:
         ad.status = AdStatus.APPROVED
         ad.expires_at = datetime.now(timezone.utc) + timedelta(days=AD_EXPIRY_DAYS)
 
-        # Подобрать до 3 рандомных фото из существующих в БД
-        all_photos_stmt = select(AdPhoto.file_id).distinct()
-        all_photo_ids = [
-            row[0]
-            for row in (await session.execute(all_photos_stmt)).all()
-        ]
+        # До 3 случайных различных фото из существующих в БД — выборку
+        # делает Postgres, в Python приходят только отобранные строки
+        sampled = (await session.execute(
+            select(AdPhoto.file_id)
+            .group_by(AdPhoto.file_id)
+            .order_by(func.random())
+            .limit(3)
+        )).scalars().all()
 
-        # Если есть фото — прикрепляем до 3 случайных
-        attached_count = 0
-        if all_photo_ids:
-            sample_size = min(3, len(all_photo_ids))
-            sampled = random.sample(all_photo_ids, sample_size)
-            for i, file_id in enumerate(sampled):
-                photo = AdPhoto(
-                    ad_type=AdType.CAR,
-                    ad_id=ad.id,
-                    file_id=file_id,
-                    position=i,
-                )
-                session.add(photo)
-                attached_count += 1
+        # Если есть фото — прикрепляем одним multi-row INSERT
+        # (ad.id уже есть: create_car_ad делает flush)
+        if sampled:
+            await session.execute(insert(AdPhoto), [
+                {"ad_type": AdType.CAR, "ad_id": ad.id, "file_id": file_id, "position": i}
+                for i, file_id in enumerate(sampled)
+            ])
 
         await session.commit()
+        _cities_cache.clear()
 
-        return web.json_response({
+        return _json_response({
             "ok": True,
             "ad": {
                 "id": ad.id,
                 "title": f"{brand} {model} ({year})",
                 "price": price,
                 "city": city,
-                "photos_attached": attached_count,
+                "photos_attached": len(sampled),
             },
         })
@@ -6,11 +6,11 @@ https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
 
 import hashlib
 import hmac
-import json
 import logging
 from urllib.parse import parse_qs, unquote
 
 from aiohttp import web
+import orjson
 
 from app.config import settings
 
@@ -61,8 +61,8 @@ def validate_init_data(init_data: str, bot_token: str) -> dict | None:
         # Parse user JSON if present
         if "user" in params:
             try:
-                params["user"] = json.loads(params["user"])
-            except (json.JSONDecodeError, TypeError):
+                params["user"] = orjson.loads(params["user"])
+            except (orjson.JSONDecodeError, TypeError):
                 pass
 
         return params
@@ -9,7 +9,7 @@ from aiogram.fsm.storage.memory import MemoryStorage
 
 from app.api import create_api_app
 from app.config import settings
-from app.database import async_session
+from app.database import async_session, read_session, warm_up_pool
 from app.handlers import start
 from app.handlers import admin
 from app.handlers import photos
@@ -36,8 +36,14 @@ async def main():
     dp.include_router(web_app.router)
     dp.include_router(start.router)
 
+    # Прогреть пул соединений к БД до приёма запросов
+    await warm_up_pool()
+
     # Start API server for Mini App catalog (pass bot + FSM storage for submit fallback)
-    api_app = create_api_app(async_session, settings.bot_token, bot=bot, storage=dp.storage)
+    api_app = create_api_app(
+        async_session, settings.bot_token, bot=bot, storage=dp.storage,
+        read_session_pool=read_session,
+    )
     runner = web.AppRunner(api_app)
     await runner.setup()
     site = web.TCPSite(runner, settings.api_host, settings.api_port)
@@ -11,6 +11,18 @@ class Settings(BaseSettings):
     channel_id: str = ""  # @channel_username or -100xxx
     admin_token: str = ""  # Secret token for admin Mini App auth
 
+    # Пул соединений к PostgreSQL (общий для бота и API)
+    db_pool_size: int = 10  # постоянные соединения
+    db_max_overflow: int = 10  # дополнительные соединения под пиковую нагрузку
+    db_pool_timeout: float = 10  # сек ожидания свободного соединения
+    db_pool_pre_ping: bool = False  # за pgbouncer ping не нужен — лишний round trip
+    db_application_name: str = "auto-sales-bot"  # видно в pg_stat_activity
+    # Кеш скомпилированного SQL (SQLAlchemy) и подготовленных выражений
+    # (asyncpg, на соединение). Комбинаций фильтров/сортировок каталога —
+    # сотни, дефолтов (500 / 100) не хватает, и вариант вытесняется.
+    db_query_cache_size: int = 1200
+    db_prepared_statement_cache_size: int = 1024
+
     model_config = {"env_file": ".env"}
 
 
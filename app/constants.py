@@ -21,6 +21,8 @@ ADS_PER_PAGE = 10
 MAX_SUBMIT_BODY_SIZE = 10 * 1024  # 10 KB
 MAX_PAGE_SIZE = 50
 DEFAULT_PAGE_SIZE = 20
+ADMIN_PENDING_PAGE_SIZE = 50
+ADMIN_PENDING_MAX_PAGE_SIZE = 200
 
 # Поиск
 MIN_SEARCH_QUERY_LENGTH = 2
@@ -28,3 +30,37 @@ MIN_SEARCH_QUERY_LENGTH = 2
 # Описание: максимум символов для превью в канале/модерации
 DESCRIPTION_PREVIEW_LENGTH = 300
 DESCRIPTION_CHANNEL_LENGTH = 500
+
+# Фото-прокси Telegram
+TG_FILE_PATH_CACHE_TTL = 50 * 60  # сек; ссылка getFile действительна ≥ 1 часа
+TG_FILE_PATH_CACHE_SIZE = 10_000
+PHOTO_PROXY_CHUNK_SIZE = 64 * 1024  # 64 KB
+PHOTO_CACHE_MAX_AGE = 86400  # Cache-Control max-age для фото (сутки)
+# Дисковый кеш Telegram-фото: предел размера и как часто его проверять
+TG_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+TG_CACHE_PRUNE_INTERVAL = 10 * 60  # сек
+# HTTP-клиент к api.telegram.org: держать TLS-соединения тёплыми между запросами
+TG_HTTP_LIMIT = 200  # всего соединений
+TG_HTTP_LIMIT_PER_HOST = 50
+TG_HTTP_KEEPALIVE_TIMEOUT = 75  # сек простоя до закрытия соединения
+TG_HTTP_DNS_CACHE_TTL = 300  # сек
+# Без общего лимита total: стрим большого фото медленному клиенту
+# может идти дольше любого фиксированного срока
+TG_HTTP_CONNECT_TIMEOUT = 10  # сек на получение соединения (пул + TCP/TLS)
+TG_HTTP_READ_TIMEOUT = 30  # сек между порциями данных от Telegram
+
+# Кеш агрегата /api/cities
+CITIES_CACHE_TTL = 60  # сек
+
+# Кеш total каталога без фильтров (главная страница /api/cars, /api/plates)
+LISTING_TOTAL_CACHE_TTL = 30  # сек
+
+# Кеш ответа /api/profile
+PROFILE_CACHE_TTL = 60  # сек
+PROFILE_CACHE_SIZE = 10_000
+
+# Размер порции при чтении загружаемых фото (multipart)
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64 KB
+
+# Генерация тестовых объявлений (admin_generate_ad?count=N)
+ADMIN_GENERATE_MAX_COUNT = 1000
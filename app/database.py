@@ -1,6 +1,34 @@
+import asyncio
+
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.config import settings
 
-engine = create_async_engine(settings.database_url)
+engine = create_async_engine(
+    settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args={
+        "server_settings": {"application_name": settings.db_application_name},
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    },
+)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
+# Сессии только для чтения: AUTOCOMMIT — без BEGIN/COMMIT на каждый запрос.
+# Тот же пул соединений; уровень изоляции сбрасывается при возврате в пул.
+read_session = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"), expire_on_commit=False,
+)
+
+
+async def warm_up_pool() -> None:
+    """Заранее открыть db_pool_size соединений, чтобы первые запросы
+    не платили за установку соединения (TCP + auth)."""
+    connections = await asyncio.gather(
+        *(engine.connect() for _ in range(settings.db_pool_size)),
+    )
+    # Возврат в пул — соединения остаются открытыми
+    await asyncio.gather(*(conn.close() for conn in connections))
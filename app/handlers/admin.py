@@ -37,6 +37,7 @@ from app.texts import (
     USER_AD_APPROVED,
     USER_AD_REJECTED,
 )
+from app.utils.profile_cache import invalidate_profile
 from app.utils.publish import publish_to_channel
 
 logger = logging.getLogger(__name__)
@@ -160,17 +161,14 @@ async def handle_moderation(
             ad = await approve_plate_ad(session, ad_id)
 
         if ad:
+            # Коммит до уведомлений и публикации — как в API; затем сброс
+            # закешированного профиля автора
+            await session.commit()
+            invalidate_profile(ad.user.telegram_id)
             await callback.answer(ADMIN_APPROVED, show_alert=False)
             # Notify user
             try:
-                from app.models.user import User
-                from sqlalchemy import select
-
-                stmt = select(User).where(User.id == ad.user_id)
-                result = await session.execute(stmt)
-                user = result.scalar_one_or_none()
-                if user:
-                    await bot.send_message(user.telegram_id, USER_AD_APPROVED)
+                await bot.send_message(ad.user.telegram_id, USER_AD_APPROVED)
             except Exception:
                 logger.exception("Failed to notify user about approval")
             # Publish to channel
@@ -264,17 +262,13 @@ async def _do_reject(
         await message.answer(ADMIN_AD_NOT_FOUND)
         return
 
+    await session.commit()
+    invalidate_profile(ad.user.telegram_id)
+
     # Notify user with reason
     try:
-        from app.models.user import User
-        from sqlalchemy import select
-
-        stmt = select(User).where(User.id == ad.user_id)
-        result = await session.execute(stmt)
-        user = result.scalar_one_or_none()
-        if user:
-            reject_text = f"😔 Ваше объявление не прошло модерацию.\nПричина: {reason}"
-            await bot.send_message(user.telegram_id, reject_text)
+        reject_text = f"😔 Ваше объявление не прошло модерацию.\nПричина: {reason}"
+        await bot.send_message(ad.user.telegram_id, reject_text)
     except Exception:
         logger.exception("Failed to notify user about rejection")
 
@@ -1,11 +1,11 @@
 """Handler for Mini App web_app_data submissions."""
 
-import json
 import logging
 
 from aiogram import Bot, Router
 from aiogram.types import Message, ReplyKeyboardMarkup, KeyboardButton
 from aiogram.fsm.context import FSMContext
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.handlers.photos import PhotoCollectStates
@@ -13,6 +13,7 @@ from app.models.car_ad import FuelType, Transmission
 from app.services.car_ad_service import create_car_ad
 from app.services.plate_ad_service import create_plate_ad
 from app.utils.mappings import FUEL_TYPE_MAP, TRANSMISSION_MAP
+from app.utils.profile_cache import invalidate_profile
 from app.services.user_service import get_or_create_user
 from app.texts import (
     WEB_APP_CAR_CREATED,
@@ -37,8 +38,8 @@ async def handle_web_app_data(
 ):
     """Process data received from Telegram Mini App."""
     try:
-        data = json.loads(message.web_app_data.data)
-    except (json.JSONDecodeError, AttributeError):
+        data = orjson.loads(message.web_app_data.data)
+    except (orjson.JSONDecodeError, AttributeError):
         logger.error("[web_app] Invalid JSON in web_app_data")
         await message.answer(WEB_APP_INVALID_DATA)
         return
@@ -67,10 +68,12 @@ async def handle_web_app_data(
         # Create ad
         if ad_type == "car_ad":
             ad = await _create_car_ad(session, user.id, data)
-            await message.answer(WEB_APP_CAR_CREATED)
         else:
             ad = await _create_plate_ad(session, user.id, data)
-            await message.answer(WEB_APP_PLATE_CREATED)
+        # Коммит до сообщений, затем сброс закешированного профиля автора
+        await session.commit()
+        invalidate_profile(message.from_user.id)
+        await message.answer(WEB_APP_CAR_CREATED if ad_type == "car_ad" else WEB_APP_PLATE_CREATED)
 
         # Ask for photos
         skip_kb = ReplyKeyboardMarkup(
@@ -1,10 +1,15 @@
 import enum
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text, and_, literal_column
+from sqlalchemy.orm import Mapped, foreign, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
+from app.models.photo import AdPhoto, AdType
+
+if TYPE_CHECKING:
+    from app.models.user import User
 
 
 class FuelType(str, enum.Enum):
@@ -39,6 +44,16 @@ class CarAd(Base, TimestampMixin):
     """Car advertisement model."""
 
     __tablename__ = "car_ads"
+    __table_args__ = (
+        # Счётчики по статусам в профиле
+        Index("ix_car_ads_user_status", "user_id", "status"),
+        # Очередь модерации / каталог: WHERE status = ... ORDER BY created_at, id
+        Index("ix_car_ads_status_created", "status", "created_at", "id"),
+        # «Мои объявления» (ORDER BY created_at DESC — обратный проход по индексу)
+        Index("ix_car_ads_user_created", "user_id", "created_at"),
+        # Проверка дублей при подаче
+        Index("ix_car_ads_dupe", "user_id", "brand", "model", "year"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(
@@ -88,3 +103,34 @@ class CarAd(Base, TimestampMixin):
     expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     # F23: ID сообщения в канале (для удаления дублей при повторной публикации)
     channel_message_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # Автор объявления. Только для чтения; грузится явно (joinedload),
+    # lazy-загрузка в async-сессии запрещена.
+    user: Mapped["User"] = relationship("User", viewonly=True, lazy="raise")
+
+    # Фото объявления (полиморфная связь по ad_type + ad_id, без FK).
+    # Только для чтения; грузится явно через selectinload — lazy-загрузка
+    # в async-сессии запрещена.
+    photos: Mapped[list[AdPhoto]] = relationship(
+        AdPhoto,
+        primaryjoin=lambda: and_(
+            foreign(AdPhoto.ad_id) == CarAd.id,
+            AdPhoto.ad_type == AdType.CAR,
+        ),
+        order_by=AdPhoto.position,
+        viewonly=True,
+        lazy="raise",
+    )
+
+
+# Текст для поиска q=: один ILIKE '%q%' по склейке колонок вместо OR по
+# каждой — одна проверка триграммного GIN-индекса (нужен pg_trgm).
+# Разделитель — литерал в SQL, а не bind-параметр: иначе выражение
+# запроса не совпадёт с выражением индекса.
+_SEARCH_SEP = literal_column("' '", String)
+CAR_SEARCH_TEXT = CarAd.brand + _SEARCH_SEP + CarAd.model + _SEARCH_SEP + CarAd.description
+
+Index(
+    "ix_car_ads_search_trgm", CAR_SEARCH_TEXT.label("search_text"),
+    postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+)
@@ -19,7 +19,12 @@ class AdPhoto(Base):
 
     __tablename__ = "ad_photos"
     __table_args__ = (
-        Index("ix_photos_type_ad", "ad_type", "ad_id"),
+        # Обложка (ORDER BY position LIMIT 1) и списки фото — index-only scan
+        Index(
+            "ix_photos_type_ad_position",
+            "ad_type", "ad_id", "position",
+            postgresql_include=["file_id"],
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -1,5 +1,6 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.models.car_ad import AdStatus, CarAd, FuelType, Transmission
 from app.models.photo import AdPhoto, AdType
@@ -79,9 +80,22 @@ async def get_pending_car_ads(session: AsyncSession) -> list[CarAd]:
     return list(result.scalars().all())
 
 
+async def _get_car_ad_for_moderation(session: AsyncSession, ad_id: int) -> CarAd | None:
+    """Load a car ad together with its author (one JOIN) for moderation.
+
+    The author is needed right after the status change to notify them.
+    """
+    stmt = select(CarAd).where(CarAd.id == ad_id).options(joinedload(CarAd.user))
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
 async def approve_car_ad(session: AsyncSession, ad_id: int) -> CarAd | None:
-    """Approve a car ad. Returns None if not found or not PENDING."""
-    ad = await get_car_ad(session, ad_id)
+    """Approve a car ad. Returns None if not found or not PENDING.
+
+    ad.user is loaded (joinedload).
+    """
+    ad = await _get_car_ad_for_moderation(session, ad_id)
     if ad and ad.status == AdStatus.PENDING:
         ad.status = AdStatus.APPROVED
         return ad
@@ -91,8 +105,11 @@ async def approve_car_ad(session: AsyncSession, ad_id: int) -> CarAd | None:
 async def reject_car_ad(
     session: AsyncSession, ad_id: int, reason: str | None = None
 ) -> CarAd | None:
-    """Reject a car ad. Returns None if not found or not PENDING."""
-    ad = await get_car_ad(session, ad_id)
+    """Reject a car ad. Returns None if not found or not PENDING.
+
+    ad.user is loaded (joinedload).
+    """
+    ad = await _get_car_ad_for_moderation(session, ad_id)
     if ad and ad.status == AdStatus.PENDING:
         ad.status = AdStatus.REJECTED
         ad.rejection_reason = reason
@@ -1,5 +1,6 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.models.car_ad import AdStatus
 from app.models.photo import AdPhoto, AdType
@@ -64,9 +65,22 @@ async def get_pending_plate_ads(session: AsyncSession) -> list[PlateAd]:
     return list(result.scalars().all())
 
 
+async def _get_plate_ad_for_moderation(session: AsyncSession, ad_id: int) -> PlateAd | None:
+    """Load a plate ad together with its author (one JOIN) for moderation.
+
+    The author is needed right after the status change to notify them.
+    """
+    stmt = select(PlateAd).where(PlateAd.id == ad_id).options(joinedload(PlateAd.user))
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
 async def approve_plate_ad(session: AsyncSession, ad_id: int) -> PlateAd | None:
-    """Approve a plate ad. Returns None if not found or not PENDING."""
-    ad = await get_plate_ad(session, ad_id)
+    """Approve a plate ad. Returns None if not found or not PENDING.
+
+    ad.user is loaded (joinedload).
+    """
+    ad = await _get_plate_ad_for_moderation(session, ad_id)
     if ad and ad.status == AdStatus.PENDING:
         ad.status = AdStatus.APPROVED
         return ad
@@ -76,8 +90,11 @@ async def approve_plate_ad(session: AsyncSession, ad_id: int) -> PlateAd | None:
 async def reject_plate_ad(
     session: AsyncSession, ad_id: int, reason: str | None = None
 ) -> PlateAd | None:
-    """Reject a plate ad. Returns None if not found or not PENDING."""
-    ad = await get_plate_ad(session, ad_id)
+    """Reject a plate ad. Returns None if not found or not PENDING.
+
+    ad.user is loaded (joinedload).
+    """
+    ad = await _get_plate_ad_for_moderation(session, ad_id)
     if ad and ad.status == AdStatus.PENDING:
         ad.status = AdStatus.REJECTED
         ad.rejection_reason = reason
@@ -61,14 +61,30 @@ async def set_admin(session: AsyncSession, telegram_id: int, is_admin: bool = Tr
     return user
 
 
-async def get_user_active_ads_count(session: AsyncSession, user_id: int) -> int:
-    """Подсчитать активные объявления пользователя."""
-    car_count = (await session.execute(
+async def get_author_with_ads_count(
+    session: AsyncSession, user_id: int
+) -> tuple[User | None, int]:
+    """Загрузить автора объявления и число его активных объявлений.
+
+    Один SELECT: пользователь + сумма двух коррелированных подзапросов
+    COUNT(*), сложенная на стороне Postgres одной колонкой ads_count.
+    """
+    car_count = (
         select(func.count()).select_from(CarAd)
-        .where(CarAd.user_id == user_id, CarAd.status == AdStatus.APPROVED)
-    )).scalar_one()
-    plate_count = (await session.execute(
+        .where(CarAd.user_id == User.id, CarAd.status == AdStatus.APPROVED)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    plate_count = (
         select(func.count()).select_from(PlateAd)
-        .where(PlateAd.user_id == user_id, PlateAd.status == AdStatus.APPROVED)
-    )).scalar_one()
-    return car_count + plate_count
+        .where(PlateAd.user_id == User.id, PlateAd.status == AdStatus.APPROVED)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    row = (await session.execute(
+        select(User, (car_count + plate_count).label("ads_count"))
+        .where(User.id == user_id)
+    )).one_or_none()
+    if row is None:
+        return None, 0
+    return row.User, row.ads_count
@@ -1,7 +1,9 @@
 """Ad view tracking utilities."""
 
-from sqlalchemy import select
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.ad_view import AdView
 from app.models.photo import AdType
@@ -14,20 +16,35 @@ async def record_unique_view(
     ad_id: int,
     ad,  # CarAd или PlateAd
 ) -> bool:
-    """Записать уникальный просмотр. Возвращает True если новый."""
+    """Записать уникальный просмотр. Возвращает True если новый.
+
+    Один атомарный запрос: INSERT в ad_views с ON CONFLICT DO NOTHING
+    (уникальность решает uq_ad_view_user_ad), а счётчик увеличивается
+    UPDATE ... SET view_count = view_count + 1 только если вставка прошла.
+    Гонки read-modify-write между параллельными просмотрами нет.
+    """
     if not viewer_id:
         return False
 
-    existing = await session.execute(
-        select(AdView).where(
-            AdView.user_id == viewer_id,
-            AdView.ad_type == ad_type,
-            AdView.ad_id == ad_id,
-        )
+    model = type(ad)
+    new_view = (
+        pg_insert(AdView)
+        .values(user_id=viewer_id, ad_type=ad_type, ad_id=ad_id)
+        .on_conflict_do_nothing(constraint="uq_ad_view_user_ad")
+        .returning(AdView.id)
+        .cte("new_view")
+    )
+    stmt = (
+        update(model)
+        .where(model.id == ad_id, exists(select(new_view.c.id)))
+        .values(view_count=func.coalesce(model.view_count, 0) + 1)
+        .returning(model.view_count)
+        .execution_options(synchronize_session=False)
     )
-    if existing.scalar_one_or_none():
+    view_count = (await session.execute(stmt)).scalar_one_or_none()
+    if view_count is None:
         return False
 
-    session.add(AdView(user_id=viewer_id, ad_type=ad_type, ad_id=ad_id))
-    ad.view_count = (ad.view_count or 0) + 1
+    # Отразить новое значение в загруженном объекте без лишнего SELECT
+    set_committed_value(ad, "view_count", view_count)
     return True
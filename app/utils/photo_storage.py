@@ -6,8 +6,15 @@
 # TODO F7: Добавить периодический cleanup для orphaned фото — файлы на диске без записи в AdPhoto
 
 Формат loc_ + hex UUID проходит валидацию _FILE_ID_RE = [A-Za-z0-9_-]+
+
+Фото из Telegram, отданные через прокси, кешируются на диск в
+TG_CACHE_DIR/{sha256(file_id)}.jpg — повторные запросы (в т.ч. Range)
+отдаются через FileResponse без похода в Bot API. Размер кеша
+ограничивается prune_tg_cache (старые файлы удаляются первыми).
 """
+import hashlib
 import os
+import tempfile
 import uuid
 from pathlib import Path
 
@@ -20,21 +27,65 @@ if not UPLOAD_DIR.exists():
 
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Дисковый кеш фото, проксированных из Telegram
+TG_CACHE_DIR = UPLOAD_DIR / "tg_cache"
+TG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
 # Допустимые MIME-типы и расширения
 ALLOWED_TYPES = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}
 MAX_PHOTO_SIZE = 5 * 1024 * 1024  # 5 MB
 LOCAL_PREFIX = "loc_"
 
+# Сколько первых байт нужно sniff_image_type (WebP: RIFF....WEBP)
+SNIFF_HEADER_SIZE = 12
+
 
-def save_photo(data: bytes, content_type: str) -> str:
-    """Сохранить фото на диск. Вернуть photo_id (loc_{uuid}).
+def sniff_image_type(head: bytes) -> str | None:
+    """MIME-тип по сигнатуре (magic bytes) начала файла.
+
+    Возвращает один из ALLOWED_TYPES или None, если формат не распознан.
+    Заголовку Content-Type от клиента не доверяем.
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def open_upload_tempfile(buffering: int = -1):
+    """Открыть временный файл для потоковой записи загрузки.
+
+    Файл создаётся в UPLOAD_DIR — та же ФС, поэтому save_photo_from_path
+    переносит его rename'ом без копирования. Удаление при ошибке — на
+    вызывающем (discard_upload_tempfile).
 
     Аргументы:
-        data — байты изображения
-        content_type — MIME-тип (image/jpeg, image/png, image/webp)
+        buffering — размер буфера записи (по умолчанию — io.DEFAULT_BUFFER_SIZE)
+    """
+    return tempfile.NamedTemporaryFile(
+        dir=UPLOAD_DIR, suffix=".part", delete=False, buffering=buffering,
+    )
 
-    Возвращает:
-        photo_id в формате "loc_{hex_uuid}"
+
+def discard_upload_tempfile(path: str) -> None:
+    """Удалить временный файл загрузки (если ещё существует)."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def save_photo_from_path(tmp_path: str, content_type: str) -> str:
+    """Сохранить загруженное во временный файл фото. Вернуть photo_id (loc_{uuid}).
+
+    Файл переносится на место через os.replace (без копирования данных).
+
+    Аргументы:
+        tmp_path — путь к временному файлу (из open_upload_tempfile)
+        content_type — MIME-тип (image/jpeg, image/png, image/webp)
 
     Исключения:
         ValueError — если тип не поддерживается или файл слишком большой
@@ -42,13 +93,12 @@ def save_photo(data: bytes, content_type: str) -> str:
     ext = ALLOWED_TYPES.get(content_type)
     if not ext:
         raise ValueError(f"Unsupported content type: {content_type}")
-    if len(data) > MAX_PHOTO_SIZE:
-        raise ValueError(f"File too large: {len(data)} bytes (max {MAX_PHOTO_SIZE})")
+    size = os.path.getsize(tmp_path)
+    if size > MAX_PHOTO_SIZE:
+        raise ValueError(f"File too large: {size} bytes (max {MAX_PHOTO_SIZE})")
 
     photo_uuid = uuid.uuid4().hex
-    filename = f"{photo_uuid}{ext}"
-    filepath = UPLOAD_DIR / filename
-    filepath.write_bytes(data)
+    os.replace(tmp_path, UPLOAD_DIR / f"{photo_uuid}{ext}")
     return f"{LOCAL_PREFIX}{photo_uuid}"
 
 
@@ -76,6 +126,18 @@ def get_photo_path(photo_id: str) -> Path | None:
     return None
 
 
+def filter_existing_photos(photo_ids: list) -> list[str]:
+    """Оставить только локальные photo_id, файлы которых есть на диске.
+
+    Делает stat() на каждый файл — блокирующий вызов, из async-кода
+    вызывать через asyncio.to_thread.
+    """
+    return [
+        pid for pid in photo_ids
+        if isinstance(pid, str) and is_local_photo(pid) and get_photo_path(pid)
+    ]
+
+
 def is_local_photo(photo_id: str) -> bool:
     """Проверить, является ли photo_id локальным (не Telegram file_id).
 
@@ -83,3 +145,78 @@ def is_local_photo(photo_id: str) -> bool:
     Telegram file_id не имеют такого префикса.
     """
     return photo_id.startswith(LOCAL_PREFIX)
+
+
+def _tg_cache_file(file_id: str) -> Path:
+    """Путь к кешу Telegram-фото. Имя — хеш file_id (без спецсимволов в пути)."""
+    digest = hashlib.sha256(file_id.encode()).hexdigest()
+    # Telegram PhotoSize всегда JPEG
+    return TG_CACHE_DIR / f"{digest}.jpg"
+
+
+def get_tg_cache_path(file_id: str) -> Path | None:
+    """Путь к закешированному Telegram-фото или None, если его ещё нет.
+
+    Делает stat() — из async-кода вызывать через asyncio.to_thread.
+    """
+    path = _tg_cache_file(file_id)
+    return path if path.exists() else None
+
+
+def open_tg_cache_tempfile(buffering: int = -1):
+    """Открыть временный файл для записи Telegram-фото в дисковый кеш.
+
+    Файл в TG_CACHE_DIR — save_tg_cache_from_path переносит его rename'ом,
+    параллельный запрос никогда не увидит недописанный файл. Удаление при
+    ошибке — на вызывающем (discard_upload_tempfile).
+    """
+    return tempfile.NamedTemporaryFile(
+        dir=TG_CACHE_DIR, suffix=".part", delete=False, buffering=buffering,
+    )
+
+
+def save_tg_cache_from_path(tmp_path: str, file_id: str) -> None:
+    """Перенести дописанный временный файл в дисковый кеш Telegram-фото.
+
+    Исключения:
+        ValueError — если файл слишком большой
+    """
+    size = os.path.getsize(tmp_path)
+    if size > MAX_PHOTO_SIZE:
+        raise ValueError(f"File too large: {size} bytes (max {MAX_PHOTO_SIZE})")
+    os.replace(tmp_path, _tg_cache_file(file_id))
+
+
+def prune_tg_cache(max_bytes: int) -> int:
+    """Удалить самые старые (по mtime) файлы кеша сверх max_bytes.
+
+    Блокирующий обход каталога — из async-кода через asyncio.to_thread.
+    Returns: число удалённых файлов.
+    """
+    entries = []
+    total = 0
+    with os.scandir(TG_CACHE_DIR) as it:
+        for entry in it:
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if not entry.is_file():
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,23 @@
+"""Кеш готовых ответов /api/profile/{telegram_id}.
+
+Общий для API и бот-хендлеров (работают в одном процессе): профиль
+сбрасывается при любом изменении пользователя или его объявлений, в том
+числе при модерации через бота.
+"""
+
+from app.constants import PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL
+from app.utils.ttl_cache import TTLCache
+
+# telegram_id → тело ответа (JSON bytes)
+profile_cache: TTLCache[int, bytes] = TTLCache(
+    ttl_seconds=PROFILE_CACHE_TTL, max_size=PROFILE_CACHE_SIZE,
+)
+
+
+def invalidate_profile(telegram_id: int) -> None:
+    """Сбросить закешированный профиль пользователя.
+
+    Вызывать после коммита — иначе параллельный запрос может снова
+    закешировать старые данные.
+    """
+    profile_cache.pop(telegram_id)
@@ -0,0 +1,82 @@
+"""In-memory TTL cache for hot API lookups.
+
+Holds values that are cheap to keep but expensive to recompute on every
+request (Telegram file paths, aggregated API responses). Entries expire
+after a fixed time-to-live and the cache is bounded in size.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-memory cache with per-entry time-to-live.
+
+    Each entry expires ``ttl_seconds`` after it was stored. When the cache
+    holds more than ``max_size`` entries, the oldest ones are evicted.
+
+    Not thread-safe: meant to be used from a single asyncio event loop,
+    where every call runs to completion without interleaving.
+
+    Usage::
+
+        cache: TTLCache[str, str] = TTLCache(ttl_seconds=60, max_size=1000)
+
+        value = cache.get(key)
+        if value is None:
+            value = await compute(key)
+            cache.set(key, value)
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024) -> None:
+        """Initialise the cache.
+
+        Args:
+            ttl_seconds: Lifetime of each entry in seconds.
+            max_size: Maximum number of entries kept at once.
+        """
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self._ttl = ttl_seconds
+        self._max_size = max_size
+        # key -> (expires_at, value); insertion order == age order.
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Return the cached value for *key*, or *default* if missing/expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store *value* under *key*, evicting the oldest entries if full."""
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """Invalidate *key* (no-op if absent)."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove **all** entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
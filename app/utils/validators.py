@@ -6,6 +6,14 @@ from datetime import datetime
 from app.data.brands import BRANDS
 from app.utils.mappings import TRANSMISSION_MAP
 
+# Собираются один раз при импорте, а не на каждый вызов валидатора
+_DIGIT_RE = re.compile(r"\d")
+# Марка → множество моделей: проверка модели за O(1) вместо поиска в списке
+_BRAND_MODELS: dict[str, frozenset[str]] = {
+    brand: frozenset(models) for brand, models in BRANDS.items()
+}
+_TRANSMISSION_VALUES = ", ".join(TRANSMISSION_MAP)
+
 
 def _check_required_string(
     data: dict,
@@ -53,7 +61,7 @@ def _check_phone(data: dict, field: str = "contact_phone") -> list[str]:
     if len(val) < 5 or len(val) > 20:
         errors.append("Контактный телефон — от 5 до 20 символов")
         return errors
-    if not re.search(r"\d", val):
+    if not _DIGIT_RE.search(val):
         errors.append("Контактный телефон — должен содержать цифры")
     return errors
 
@@ -75,10 +83,11 @@ def validate_car_ad(data: dict) -> list[str]:
     brand_val = str(data.get("brand", "")).strip()
     model_val = str(data.get("model", "")).strip()
     if brand_val and brand_val != "Другая":
-        if brand_val not in BRANDS:
+        models = _BRAND_MODELS.get(brand_val)
+        if models is None:
             errors.append(f"Марка «{brand_val}» не найдена в каталоге")
         elif model_val and model_val != "Другая":
-            if model_val not in BRANDS[brand_val]:
+            if model_val not in models:
                 errors.append(f"Модель «{model_val}» не найдена для марки «{brand_val}»")
 
     # year (required, int, 1960 — текущий год + 1)
@@ -124,8 +133,7 @@ def validate_car_ad(data: dict) -> list[str]:
     trans = data.get("transmission")
     if trans is not None and trans != "":
         if str(trans) not in TRANSMISSION_MAP:
-            allowed = ", ".join(TRANSMISSION_MAP.keys())
-            errors.append(f"Коробка передач — допустимые значения: {allowed}")
+            errors.append(f"Коробка передач — допустимые значения: {_TRANSMISSION_VALUES}")
 
     # city
     errors.extend(_check_required_string(data, "city", "Город", 1, 100))
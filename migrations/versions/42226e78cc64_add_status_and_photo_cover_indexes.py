@@ -0,0 +1,38 @@
+"""add_status_and_photo_cover_indexes
+
+Revision ID: 42226e78cc64
+Revises: f43172cd3b52
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '42226e78cc64'
+down_revision: Union[str, Sequence[str], None] = 'f43172cd3b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_car_ads_status_created', 'car_ads', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_plate_ads_status_created', 'plate_ads', ['status', 'created_at', 'id'], unique=False)
+    # Покрывающий индекс обложки заменяет ix_photos_type_ad (его префикс)
+    op.create_index(
+        'ix_photos_type_ad_position', 'ad_photos', ['ad_type', 'ad_id', 'position'],
+        unique=False, postgresql_include=['file_id'],
+    )
+    op.drop_index('ix_photos_type_ad', table_name='ad_photos')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_photos_type_ad', 'ad_photos', ['ad_type', 'ad_id'], unique=False)
+    op.drop_index('ix_photos_type_ad_position', table_name='ad_photos')
+    op.drop_index('ix_plate_ads_status_created', table_name='plate_ads')
+    op.drop_index('ix_car_ads_status_created', table_name='car_ads')
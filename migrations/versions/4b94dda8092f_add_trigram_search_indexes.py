@@ -0,0 +1,33 @@
+"""add_trigram_search_indexes
+
+Revision ID: 4b94dda8092f
+Revises: 42226e78cc64
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b94dda8092f'
+down_revision: Union[str, Sequence[str], None] = '42226e78cc64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Только расширение pg_trgm. Поколоночные триграммные индексы отсюда
+    заменены индексами по склейке колонок в d1e5a3c07b42 — строить их,
+    чтобы тут же удалить, незачем.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Расширение не удаляем — им могут пользоваться другие объекты БД
@@ -0,0 +1,50 @@
+"""concat_search_trigram_index
+
+Revision ID: d1e5a3c07b42
+Revises: 4b94dda8092f
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e5a3c07b42'
+down_revision: Union[str, Sequence[str], None] = '4b94dda8092f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Поколоночные триграммные индексы из ранней версии 4b94dda8092f —
+# удаляются, если БД успела их получить (иначе DROP ... IF EXISTS — no-op)
+_LEGACY_TRGM_INDEXES = (
+    'ix_car_ads_brand_trgm',
+    'ix_car_ads_model_trgm',
+    'ix_car_ads_description_trgm',
+    'ix_plate_ads_plate_number_trgm',
+    'ix_plate_ads_description_trgm',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name in _LEGACY_TRGM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    # Выражение должно совпадать с CAR_SEARCH_TEXT / PLATE_SEARCH_TEXT
+    op.execute(
+        "CREATE INDEX ix_car_ads_search_trgm ON car_ads USING gin "
+        "((brand || ' ' || model || ' ' || description) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_plate_ads_search_trgm ON plate_ads USING gin "
+        "((plate_number || ' ' || description) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_plate_ads_search_trgm', table_name='plate_ads')
+    op.drop_index('ix_car_ads_search_trgm', table_name='car_ads')
@@ -0,0 +1,38 @@
+"""add_user_composite_indexes_ads
+
+Revision ID: f43172cd3b52
+Revises: 489f2a89e0c7
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f43172cd3b52'
+down_revision: Union[str, Sequence[str], None] = '489f2a89e0c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_car_ads_user_status', 'car_ads', ['user_id', 'status'], unique=False)
+    op.create_index('ix_car_ads_user_created', 'car_ads', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_car_ads_dupe', 'car_ads', ['user_id', 'brand', 'model', 'year'], unique=False)
+    op.create_index('ix_plate_ads_user_status', 'plate_ads', ['user_id', 'status'], unique=False)
+    op.create_index('ix_plate_ads_user_created', 'plate_ads', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_plate_ads_dupe', 'plate_ads', ['user_id', 'plate_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_plate_ads_dupe', table_name='plate_ads')
+    op.drop_index('ix_plate_ads_user_created', table_name='plate_ads')
+    op.drop_index('ix_plate_ads_user_status', table_name='plate_ads')
+    op.drop_index('ix_car_ads_dupe', table_name='car_ads')
+    op.drop_index('ix_car_ads_user_created', table_name='car_ads')
+    op.drop_index('ix_car_ads_user_status', table_name='car_ads')